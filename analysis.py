@@ -1,12 +1,16 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from timeit import timeit
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from customers import Point
 from genetic_algorithm.strategies import *
 from model import Model
 
+_worker_model = None
+
 
 class Analysis:
     GENERATIONS = 100
@@ -16,10 +20,11 @@ class Analysis:
     PC_IMPACT_SUBDIRECTORY = "pc_impact"
     problem_seed = 1
 
-    def __init__(self, customer_count=15, vehicle_count=3, results_directory=None):
+    def __init__(self, customer_count=15, vehicle_count=3, results_directory=None, max_workers=None):
         self.model = Model()
         self.customer_count = customer_count
         self.vehicle_count = vehicle_count
+        self.max_workers = max_workers
         self.results_directory = results_directory
         if results_directory is None:
             self.results_directory = f"analysis_results_cus{customer_count}_veh{vehicle_count}"
@@ -27,9 +32,11 @@ class Analysis:
     def analyse_crossovers(self, crossover_methods, iterations=TEST_ITERATIONS, generations=GENERATIONS, **kwargs):
         self._generate_problem()
         method_scores = []
+        method_results = self._get_results_for_runs(
+            [dict(generations=generations, crossover_method=method, **kwargs) for method in crossover_methods],
+            iterations)
 
-        for method in crossover_methods:
-            results = self._get_results(iterations, generations=generations, crossover_method=method, **kwargs)
+        for method, results in zip(crossover_methods, method_results):
             best_scores, mean_scores, std_scores = zip(
                 *(self._calculate_scores_statistics(results, gen) for gen in range(generations + 1)))
 
@@ -49,6 +56,10 @@ class Analysis:
         self._generate_problem()
         probabilities = np.arange(0.0, 1.1, 0.1)
         method_final_scores = []
+        pc_results = iter(self._get_results_for_runs(
+            [dict(generations=generations, crossover_method=method, pc=pc, **kwargs)
+             for method in crossover_methods for pc in probabilities],
+            iterations))
 
         for method in crossover_methods:
             best_final_scores = []
@@ -56,8 +67,7 @@ class Analysis:
             std_final_scores = []
 
             for pc in probabilities:
-                results = self._get_results(iterations, generations=generations, crossover_method=method, pc=pc,
-                                            **kwargs)
+                results = next(pc_results)
                 best_score, mean_score, std_score = self._calculate_scores_statistics(results)
                 best_final_scores.append(best_score)
                 mean_final_scores.append(mean_score)
@@ -79,14 +89,22 @@ class Analysis:
         self.model.generate_customers(self.customer_count)
 
     def _get_results(self, iterations, output=False, **kwargs):
-        results = []
+        return self._get_results_for_runs([kwargs], iterations, output)[0]
+
+    def _get_results_for_runs(self, runs, iterations, output=False):
+        seeds = [i for _ in runs for i in range(iterations)]
+        runs_kwargs = [dict(output=output, show_plot=output, vehicle_count=self.vehicle_count, **kwargs)
+                       for kwargs in runs for _ in range(iterations)]
 
-        for i in range(iterations):
-            np.random.seed(i)
-            self.model.generate_routes(output=output, show_plot=output, vehicle_count=self.vehicle_count, **kwargs)
-            results.append(self.model.result)
+        if output or self.max_workers == 1:
+            results = [_run_seeded(self.model, seed, kwargs) for seed, kwargs in zip(seeds, runs_kwargs)]
+        else:
+            depot = (self.model.depot.x, self.model.depot.y)
+            with ProcessPoolExecutor(self.max_workers, initializer=_init_worker,
+                                     initargs=(self.model.customers, depot)) as executor:
+                results = list(executor.map(_run_worker, seeds, runs_kwargs))
 
-        return results
+        return [results[i:i + iterations] for i in range(0, len(results), iterations)]
 
     @staticmethod
     def _calculate_scores_statistics(results, generation=-1):
@@ -225,6 +243,23 @@ def pretty_name(crossover_method):
     return crossover_method.__name__.replace("_", " ")
 
 
+def _run_seeded(model, seed, kwargs):
+    model.generate_routes(rng=np.random.default_rng(seed), **kwargs)
+    return model.result
+
+
+def _init_worker(customers, depot):
+    global _worker_model
+    _worker_model = Model()
+    _worker_model.depot = Point(*depot)
+    _worker_model.customers = customers
+    _worker_model.update_targets()
+
+
+def _run_worker(seed, kwargs):
+    return _run_seeded(_worker_model, seed, kwargs)
+
+
 if __name__ == "__main__":
     analysis = Analysis(customer_count=15, vehicle_count=3)
     analyzed_crossover_methods = [order_crossover, order_based_crossover, partially_mapped_crossover, cycle_crossover]
@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from customers import Customer, CustomerPair, INSTANCE_EXTENSION
+from distance_cache import DistanceMatrixCache
+from genetic_algorithm import GA
+from genetic_algorithm.strategies import *
+from model import Model
+
+CROSSOVER_METHODS = {method.__name__: method for method in (
+    order_crossover, order_based_crossover, position_based_crossover, partially_mapped_crossover, cycle_crossover,
+    edge_recombination_crossover)}
+SELECTION_METHODS = {method.__name__: method for method in (
+    roulette_wheel_selection, tournament_selection, linear_rank_selection, stochastic_universal_sampling)}
+CUSTOMER_CLASSES = {"single": Customer, "pair": CustomerPair}
+INSTANCE_EXTENSIONS = (".csv", INSTANCE_EXTENSION)
+OUTPUT_FORMATS = ("json", "csv")
+
+
+def solve(model, args):
+    rng = np.random.default_rng(args.seed) if args.seed is not None else None
+    model.generate_routes(args.vehicles, args.size, args.generations, args.pc, args.pm, args.distance_factor,
+                          args.time_factor, CROSSOVER_METHODS[args.crossover], args.two_opt, args.inter_route,
+                          SELECTION_METHODS[args.selection], args.elite, args.time_limit, args.stall_limit,
+                          args.target_score, output=False, show_plot=False, islands=args.islands, rng=rng)
+    if model.result is None:
+        raise ValueError("Incorrect parameters")
+    return model.result
+
+
+def create_model(args):
+    distance_cache = DistanceMatrixCache(args.distance_cache) if args.distance_cache else None
+    return Model(distance_cache=distance_cache, backend=args.backend, fitness_cache_size=args.fitness_cache)
+
+
+def solution_to_dict(model, result, instance=None):
+    return {"instance": instance,
+            "score": float(result.score),
+            "distance": float(result.distance),
+            "time": float(result.time),
+            "execution_time": result.execution_time,
+            "stop_reason": result.stop_reason,
+            "generations": len(result.best_scores_history) - 1,
+            "cache_stats": result.cache_stats,
+            "routes": [[int(target) for target in route] for route in result.solution],
+            "coordinates": [model.targets[0].get_coordinates()] + [c.get_coordinates() for c in model.customers]}
+
+
+def write_solution(model, result, file, output_format="json", instance=None):
+    if output_format == "json":
+        with open(file, "w") as json_file:
+            json.dump(solution_to_dict(model, result, instance), json_file, indent=2)
+        return
+
+    with open(file, "w", newline="") as csvfile:
+        csvwriter = csv.writer(csvfile)
+        csvwriter.writerow(["vehicle", "stop", "target"] + type(model.targets[0]).COLUMNS)
+        for vehicle, route in enumerate(result.solution):
+            for stop, target in enumerate(route):
+                csvwriter.writerow([vehicle, stop, target] + model.targets[target].get_coordinates())
+
+
+def output_format_for(file, default="json"):
+    extension = os.path.splitext(file)[1].lstrip(".").lower()
+    return extension if extension in OUTPUT_FORMATS else default
+
+
+def solve_instance(file, output_file, args):
+    model = create_model(args)
+    model.read_customers(file)
+    result = solve(model, args)
+    write_solution(model, result, output_file, args.format, os.path.basename(file))
+    return file, float(result.score), result.execution_time
+
+
+def run_solve(args):
+    model = create_model(args)
+    if args.instance:
+        model.read_customers(args.instance)
+    else:
+        if args.seed is not None:
+            np.random.seed(args.seed)
+        model.generate_customers(args.generate, CUSTOMER_CLASSES[args.customer_type])
+        if args.save_instance:
+            model.save_customers(args.save_instance)
+
+    result = solve(model, args)
+    if args.output:
+        write_solution(model, result, args.output, args.format or output_format_for(args.output), args.instance)
+    else:
+        json.dump(solution_to_dict(model, result, args.instance), sys.stdout, indent=2)
+        print()
+
+
+def run_batch(args):
+    args.format = args.format or "json"
+    files = sorted(os.path.join(args.directory, name) for name in os.listdir(args.directory)
+                   if name.lower().endswith(INSTANCE_EXTENSIONS))
+    os.makedirs(args.output, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = {executor.submit(solve_instance, file, os.path.join(
+            args.output, f"{os.path.splitext(os.path.basename(file))[0]}.{args.format}"), args): file for file in files}
+        for future, file in futures.items():
+            try:
+                _, score, execution_time = future.result()
+                print(f"{file}: Score: {score} Execution time: {execution_time}")
+            except (ValueError, OSError) as e:
+                failed += 1
+                print(f"{file}: {type(e).__name__}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def add_solver_arguments(parser):
+    parser.add_argument("--vehicles", type=int, default=Model.DEFAULT_VEHICLE_COUNT)
+    parser.add_argument("--size", type=int, default=Model.DEFAULT_POP_SIZE)
+    parser.add_argument("--generations", type=int, default=Model.DEFAULT_GENERATIONS)
+    parser.add_argument("--pc", type=float, default=Model.DEFAULT_PC)
+    parser.add_argument("--pm", type=float, default=Model.DEFAULT_PM)
+    parser.add_argument("--distance-factor", type=float, default=Model.DEFAULT_DISTANCE_FACTOR)
+    parser.add_argument("--time-factor", type=float, default=Model.DEFAULT_TIME_FACTOR)
+    parser.add_argument("--crossover", choices=CROSSOVER_METHODS, default=Model.DEFAULT_CROSSOVER_METHOD.__name__)
+    parser.add_argument("--selection", choices=SELECTION_METHODS, default=Model.DEFAULT_SELECTION_METHOD.__name__)
+    parser.add_argument("--elite", type=int, default=Model.DEFAULT_ELITE_COUNT)
+    parser.add_argument("--two-opt", action="store_true")
+    parser.add_argument("--inter-route", action="store_true")
+    parser.add_argument("--time-limit", type=float)
+    parser.add_argument("--stall-limit", type=int)
+    parser.add_argument("--target-score", type=float)
+    parser.add_argument("--islands", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--backend", choices=GA.BACKENDS, default=Model.DEFAULT_BACKEND)
+    parser.add_argument("--distance-cache", metavar="DIRECTORY")
+    parser.add_argument("--fitness-cache", type=int, metavar="SIZE", default=Model.DEFAULT_FITNESS_CACHE_SIZE,
+                        help="fitness cache entries, 0 disables the cache")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Solve VRP instances without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="solve a single instance")
+    instance = solve_parser.add_mutually_exclusive_group(required=True)
+    instance.add_argument("instance", nargs="?", help="instance file (.csv or .npz)")
+    instance.add_argument("--generate", type=int, metavar="COUNT", help="generate a random instance")
+    solve_parser.add_argument("--customer-type", choices=CUSTOMER_CLASSES, default="single")
+    solve_parser.add_argument("--save-instance", metavar="FILE")
+    solve_parser.add_argument("-o", "--output", metavar="FILE")
+    add_solver_arguments(solve_parser)
+    solve_parser.set_defaults(run=run_solve)
+
+    batch_parser = commands.add_parser("batch", help="solve every instance in a directory concurrently")
+    batch_parser.add_argument("directory")
+    batch_parser.add_argument("-o", "--output", metavar="DIRECTORY", required=True)
+    batch_parser.add_argument("--workers", type=int)
+    add_solver_arguments(batch_parser)
+    batch_parser.set_defaults(run=run_batch)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return args.run(args)
+    except (ValueError, OSError) as e:
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
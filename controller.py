@@ -1,12 +1,24 @@
 import tkinter as tk
+from queue import Queue, Empty
+from threading import Thread
 
+from genetic_algorithm import Cancellation
+from genetic_algorithm.utils import plot_results
 from model import Model
 
 
 class Controller:
+    POLL_INTERVAL = 50
+
     def __init__(self, model: Model):
         self.root = tk.Tk()
         self.model = model
+        self.solver_thread = None
+        self.cancellation = None
+        self.progress = Queue()
+        self.best_scores = []
+        self.mean_scores = []
+        self.global_best_scores = []
         from view import GUI
         self.view = GUI(model, self, self.root)
 
@@ -16,16 +28,80 @@ class Controller:
         self.root.mainloop()
 
     def generate_customers(self, *args, **kwargs):
+        self.stop_routes_generation()
         self.model.generate_customers(*args, **kwargs)
         self.update_view()
 
     def generate_customers_along_the_lines(self, *args, **kwargs):
+        self.stop_routes_generation()
         self.model.generate_customers_along_the_lines(*args, **kwargs)
         self.update_view()
 
     def generate_routes(self, *args, **kwargs):
-        self.model.generate_routes(*args, **kwargs)
-        self.update_view()
+        if self.solver_thread is not None:
+            return
+
+        self.cancellation = Cancellation()
+        self.best_scores, self.mean_scores, self.global_best_scores = [], [], []
+        self.solver_thread = Thread(target=self._generate_routes_in_background, args=args, kwargs=kwargs,
+                                    daemon=True)
+        self.solver_thread.start()
+        self.view.optimization_tab.set_running(True)
+        self.root.after(self.POLL_INTERVAL, self._poll_progress)
+
+    def cancel_routes_generation(self):
+        if self.cancellation is not None:
+            self.cancellation.cancel()
+
+    def stop_routes_generation(self):
+        if self.solver_thread is not None:
+            self.cancel_routes_generation()
+            self.solver_thread.join()
+            self._poll_progress(show_plot=False)
+
+    def _generate_routes_in_background(self, *args, **kwargs):
+        try:
+            for step in self.model.generate_routes_iter(*args, cancellation=self.cancellation, **kwargs):
+                routes = self.model.calculate_routes_vectors(step.solution) if step.improved else None
+                self.progress.put((step, routes))
+        except ValueError as e:
+            print(f"ValueError: {e}")
+        finally:
+            self.progress.put(None)
+
+    def _poll_progress(self, show_plot=True):
+        if self.solver_thread is None:
+            return
+
+        step, routes, finished = None, None, False
+        while not finished:
+            try:
+                item = self.progress.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                finished = True
+                continue
+            step, new_routes = item
+            routes = new_routes if new_routes is not None else routes
+            self.best_scores.append(step.best_score)
+            self.mean_scores.append(step.mean_score)
+            self.global_best_scores.append(step.global_best_score)
+
+        if step is not None:
+            self.view.optimization_tab.update_progress(step)
+        if routes is not None:
+            self.view.update_canvas(routes)
+
+        if finished:
+            self.solver_thread.join()
+            self.solver_thread = None
+            self.view.optimization_tab.set_running(False)
+            self.update_view()
+            if show_plot and self.global_best_scores and self.view.optimization_tab.should_show_plot():
+                plot_results(self.global_best_scores, self.best_scores, self.mean_scores, block=False)
+        else:
+            self.root.after(self.POLL_INTERVAL, self._poll_progress)
 
     def navigate_result_history(self, index_change):
         def inner():
@@ -35,6 +111,7 @@ class Controller:
         return inner
 
     def update_depot_position(self, *args, **kwargs):
+        self.stop_routes_generation()
         self.model.set_depot_position(*args, **kwargs)
         self.update_view()
 
@@ -47,6 +124,7 @@ class Controller:
     def read_customers(self):
         file_path = self.view.ask_open_file_dialog()
         if file_path:
+            self.stop_routes_generation()
             self.model.read_customers(file_path)
             self.update_view()
 
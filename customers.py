@@ -1,8 +1,15 @@
 import csv
+import io
 import math
+import os
+import struct
+import tempfile
+import zipfile
 
 import numpy as np
 
+INSTANCE_EXTENSION = ".npz"
+
 
 def write_customers_to_file(customers, column_names, file):
     rows = [customer.get_coordinates() for customer in customers]
@@ -13,21 +20,83 @@ def write_customers_to_file(customers, column_names, file):
 
 
 def read_customers_from_file(file):
-    customers = []
+    return customers_from_coordinates(read_coordinates_from_file(file))
+
+
+def read_coordinates_from_file(file):
     with open(file, 'r', newline='') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader)
-        for row in csvreader:
-            customers.append(retrieve_customer(row))
-    return customers
+        column_names = next(csv.reader(csvfile))
+        data = csvfile.read()
+    if not data.strip():
+        return np.empty((0, len(column_names)), dtype=int)
+    return np.loadtxt(io.StringIO(data), delimiter=",", dtype=int, ndmin=2)
 
 
 def retrieve_customer(row):
-    row = list(map(int, row))
+    return get_customer_class(len(row)).from_coordinates(list(map(int, row)))
+
+
+def customers_from_coordinates(coordinates, customer_class=None):
+    if customer_class is None:
+        customer_class = get_customer_class(coordinates.shape[1])
+    return [customer_class.from_coordinates(row) for row in np.asarray(coordinates).tolist()]
+
+
+def get_customer_class(column_count):
+    for customer_class in CUSTOMER_CLASSES.values():
+        if len(customer_class.COLUMNS) == column_count:
+            return customer_class
+    raise ValueError("Incorrect file format")
+
+
+def write_instance_to_file(file, customers, depot, distance_matrix=None):
+    customer_class = type(customers[0])
+    arrays = {"coordinates": np.array([customer.get_coordinates() for customer in customers]),
+              "customer_type": np.array(customer_class.__name__),
+              "depot": np.array([depot.x, depot.y])}
+    if distance_matrix is not None:
+        arrays["distance_matrix"] = np.asarray(distance_matrix)
+    descriptor, temp_path = tempfile.mkstemp(suffix=INSTANCE_EXTENSION, dir=os.path.dirname(os.path.abspath(file)))
     try:
-        return Customer(Point(*row))
-    except TypeError:
-        return CustomerPair(Point(row[0], row[1]), Point(row[2], row[3]))
+        with os.fdopen(descriptor, "wb") as instance_file:
+            np.savez(instance_file, **arrays)
+        os.replace(temp_path, file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_instance_from_file(file):
+    if not file.endswith(INSTANCE_EXTENSION):
+        return read_customers_from_file(file), None, None
+
+    with np.load(file) as instance:
+        customer_class = CUSTOMER_CLASSES[str(instance["customer_type"])]
+        customers = customers_from_coordinates(instance["coordinates"], customer_class)
+        depot = Point(*instance["depot"].tolist())
+        has_distance_matrix = "distance_matrix" in instance.files
+    distance_matrix = _memmap_npz_member(file, "distance_matrix") if has_distance_matrix else None
+    return customers, depot, distance_matrix
+
+
+def _memmap_npz_member(file, name):
+    with zipfile.ZipFile(file) as archive:
+        info = archive.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        with np.load(file) as instance:
+            return instance[name]
+
+    with open(file, "rb") as instance_file:
+        instance_file.seek(info.header_offset)
+        name_length, extra_length = struct.unpack("<HH", instance_file.read(30)[26:30])
+        instance_file.seek(name_length + extra_length, io.SEEK_CUR)
+        version = np.lib.format.read_magic(instance_file)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) \
+            else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(instance_file)
+        offset = instance_file.tell()
+    return np.memmap(file, dtype=dtype, mode="c", offset=offset, shape=shape, order="F" if fortran_order else "C")
 
 
 class Point:
@@ -64,6 +133,20 @@ class Customer(Point):
     def get_coordinates(self):
         return [self.x, self.y]
 
+    @classmethod
+    def from_coordinates(cls, coordinates):
+        return cls(Point(*coordinates))
+
+    @classmethod
+    def calculate_distance_matrix(cls, coordinates, dtype=np.float64):
+        return cls.calculate_distances(coordinates, coordinates, dtype)
+
+    @staticmethod
+    def calculate_distances(origins, destinations, dtype=np.float64):
+        origins, destinations = np.asarray(origins, dtype=dtype), np.asarray(destinations, dtype=dtype)
+        return np.hypot(origins[:, 0, np.newaxis] - destinations[:, 0],
+                        origins[:, 1, np.newaxis] - destinations[:, 1])
+
     @classmethod
     def random(cls):
         return cls(Point.random())
@@ -87,11 +170,22 @@ class CustomerPair(Customer):
         return self.end.distance(other.start) + other.distance_value
 
     def get_vectors_to(self, other):
-        return [(other.start, other.end), (self.end, other.start)]
+        return [(self.end, other.start), (other.start, other.end)]
 
     def get_coordinates(self):
         return [self.start.x, self.start.y, self.end.x, self.end.y]
 
+    @classmethod
+    def from_coordinates(cls, coordinates):
+        return cls(Point(*coordinates[:2]), Point(*coordinates[2:]))
+
+    @staticmethod
+    def calculate_distances(origins, destinations, dtype=np.float64):
+        origins, destinations = np.asarray(origins, dtype=dtype), np.asarray(destinations, dtype=dtype)
+        start_x, start_y, end_x, end_y = destinations.T
+        distance_values = np.hypot(end_x - start_x, end_y - start_y)
+        return np.hypot(origins[:, 2, np.newaxis] - start_x, origins[:, 3, np.newaxis] - start_y) + distance_values
+
     @classmethod
     def random(cls):
         start = Point.random()
@@ -102,3 +196,6 @@ class CustomerPair(Customer):
 
     def __str__(self):
         return f"Customer Pair: Start {self.start}, End {self.end}, Distance {self.distance_value}"
+
+
+CUSTOMER_CLASSES = {customer_class.__name__: customer_class for customer_class in (Customer, CustomerPair)}
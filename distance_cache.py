@@ -0,0 +1,84 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+class DistanceMatrixCache:
+    DEFAULT_MAX_BYTES = 1 << 30
+    EXTENSION = ".npy"
+    TEMP_EXTENSION = ".tmp"
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.validate()
+        os.makedirs(directory, exist_ok=True)
+
+    def get_distance_matrix(self, target_class, coordinates, dtype=np.float64):
+        path = self.path(self.key(target_class, coordinates, dtype))
+        try:
+            distance_matrix = np.load(path, mmap_mode="c")
+            os.utime(path)
+            self.hits += 1
+            return distance_matrix
+        except (FileNotFoundError, ValueError):
+            pass
+
+        self.misses += 1
+        distance_matrix = target_class.calculate_distance_matrix(coordinates, dtype)
+        self.store(path, distance_matrix)
+        return distance_matrix
+
+    @staticmethod
+    def key(target_class, coordinates, dtype):
+        coordinates = np.ascontiguousarray(coordinates)
+        digest = hashlib.sha256()
+        digest.update(f"{target_class.__name__}:{np.dtype(dtype).str}:{coordinates.dtype.str}:{coordinates.shape}"
+                      .encode())
+        digest.update(coordinates.tobytes())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def store(self, path, distance_matrix):
+        if distance_matrix.nbytes > self.max_bytes:
+            return
+        self.evict(self.max_bytes - distance_matrix.nbytes)
+        file, temp_path = tempfile.mkstemp(suffix=self.TEMP_EXTENSION, dir=self.directory)
+        try:
+            with os.fdopen(file, "wb") as temp_file:
+                np.save(temp_file, distance_matrix)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self, max_bytes=None):
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION) and entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        self.evict(0)
+
+    def validate(self):
+        if not self.directory or self.max_bytes < 0:
+            raise ValueError("Incorrect parameters")
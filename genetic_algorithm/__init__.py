@@ -1 +1,4 @@
-from genetic_algorithm.ga import GA
+from genetic_algorithm.cache import FitnessCache
+from genetic_algorithm.ga import GA, EvolutionStep
+from genetic_algorithm.islands import IslandGA
+from genetic_algorithm.stopping import Cancellation
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class LRUCache:
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.validate()
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.max_size == 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "size": len(self.entries),
+                "max_size": self.max_size}
+
+    def validate(self):
+        if self.max_size < 0:
+            raise ValueError("Incorrect parameters")
+
+
+class FitnessCache(LRUCache):
+
+    def evaluate(self, population, evaluate_func):
+        result = np.empty((len(population), 3))
+        missing = {}
+        for i, row in enumerate(population):
+            key = row.tobytes()
+            value = self.get(key)
+            if value is not None:
+                result[i] = value
+            else:
+                missing.setdefault(key, []).append(i)
+
+        self.misses += len(missing)
+        self.hits += len(population) - len(missing)
+        if missing:
+            values = evaluate_func(population[[indices[0] for indices in missing.values()]])
+            for (key, indices), value in zip(missing.items(), values):
+                result[indices] = value
+                self.put(key, value.copy())
+        return result
@@ -1,65 +1,122 @@
+from genetic_algorithm import kernels
+from genetic_algorithm.cache import FitnessCache
+from genetic_algorithm.local_search import *
+from genetic_algorithm.stopping import StoppingCriteria
 from genetic_algorithm.strategies import *
 from genetic_algorithm.utils import *
 
 
 class GA:
+    NEIGHBOR_COUNT = 10
+    INTER_ROUTE_SEARCH_RATE = 0.1
+    NUMPY = "numpy"
+    NUMBA = "numba"
+    BACKENDS = (NUMPY, NUMBA)
 
-    def __init__(self, customer_count, vehicle_count, distance_factor, time_factor, calculate_distance_func):
+    def __init__(self, customer_count, vehicle_count, distance_factor, time_factor, calculate_distance_func,
+                 distance_matrix=None, rng=None, fitness_cache: FitnessCache = None, backend=NUMPY):
         self.customer_count = customer_count
         self.vehicle_count = vehicle_count
         self.distance_factor = distance_factor
         self.time_factor = time_factor
         self.calculate_distance_func = calculate_distance_func
+        self.distance_matrix = distance_matrix
+        self.rng = rng if rng is not None else np.random.default_rng(np.random.randint(np.iinfo(np.int32).max))
+        self.fitness_cache = fitness_cache
+        self.backend = backend
+        self._neighbors = None
+        self._is_symmetric = None
+        self._search_distance_matrix = None
+        self._buffers = {}
         self.validate()
+        if self.backend == self.NUMBA and not kernels.NUMBA_AVAILABLE:
+            self.backend = self.NUMPY
 
-    def evolve(self, size, generations, pc, pm, crossover_method=order_crossover, enable_2_opt=False, show_plot=True):
-        self.validate_evolve(size, generations)
+    def evolve(self, size, generations, pc, pm, crossover_method=order_crossover, enable_2_opt=False, show_plot=True,
+               enable_inter_route=False, selection_method=roulette_wheel_selection, elite_count=0, time_limit=None,
+               stall_limit=None, target_score=None, cancellation=None):
+        return collect_evolution(self.evolve_iter(size, generations, pc, pm, crossover_method, enable_2_opt,
+                                                  enable_inter_route, selection_method, elite_count, time_limit,
+                                                  stall_limit, target_score, cancellation), show_plot)
+
+    def evolve_iter(self, size, generations, pc, pm, crossover_method=order_crossover, enable_2_opt=False,
+                    enable_inter_route=False, selection_method=roulette_wheel_selection, elite_count=0,
+                    time_limit=None, stall_limit=None, target_score=None, cancellation=None):
+        self.validate_evolve(size, generations, elite_count)
+        stopping_criteria = StoppingCriteria(generations, time_limit, stall_limit, target_score, cancellation)
         pop = self.generate_population(size)
-        result, solutions = self.evaluate(pop)
+        result = self.evaluate(pop, decode=False)
         scores = result[:, 0]
         min_index = np.argmin(scores)
 
-        best_solution = solutions[min_index]
         best_score = result[min_index][0]
-        best_distance = result[min_index][1]
-        best_time = result[min_index][2]
         global_best_scores = [best_score]
-        best_scores = [best_score]
-        mean_scores = [np.average(scores)]
-
-        for _ in range(generations):
-            pop = self.selection(pop, scores=scores)
-            pop = self.crossover(pop, crossover_method, pc)
-            pop = self.mutation(pop, pm)
+        stop_reason = stopping_criteria.check(global_best_scores)
+        yield EvolutionStep(0, best_score, np.average(scores), best_score, self.decode_individual(pop[min_index]),
+                            result[min_index][1], result[min_index][2], stop_reason)
 
-            pop = self.two_opt_for_population(pop) if enable_2_opt else pop
-            result, solutions = self.evaluate(pop)
+        while stop_reason is None:
+            pop, result = self.evolve_generation(pop, result, pc, pm, crossover_method, enable_2_opt,
+                                                 enable_inter_route, selection_method, elite_count)
             scores = result[:, 0]
             min_index = np.argmin(scores)
             temp_best_score = result[min_index][0]
-
-            if best_score > temp_best_score:
-                best_score = temp_best_score
-                best_solution = solutions[min_index]
-                best_distance = result[min_index][1]
-                best_time = result[min_index][2]
+            improved = best_score > temp_best_score
+            best_score = min(best_score, temp_best_score)
 
             global_best_scores.append(best_score)
-            best_scores.append(temp_best_score)
-            mean_scores.append(np.average(scores))
+            stop_reason = stopping_criteria.check(global_best_scores)
+            step = EvolutionStep(len(global_best_scores) - 1, temp_best_score, np.average(scores), best_score,
+                                 stop_reason=stop_reason)
+            if improved:
+                step.solution = self.decode_individual(pop[min_index])
+                step.distance, step.time = result[min_index][1], result[min_index][2]
+            yield step
+
+    def evolve_generation(self, pop, result, pc, pm, crossover_method=order_crossover, enable_2_opt=False,
+                          enable_inter_route=False, selection_method=roulette_wheel_selection, elite_count=0):
+        elite = np.argsort(result[:, 0], kind="stable")[:elite_count]
+        new_pop, new_result = self.next_buffers(pop, result)
+        new_pop[:len(elite)], new_result[:len(elite)] = pop[elite], result[elite]
+
+        offspring = new_pop[len(elite):]
+        self.selection(pop, result[:, 0], selection_method, out=offspring)
+        self.crossover(offspring, crossover_method, pc)
+        self.mutation(offspring, pm)
 
-        if show_plot:
-            plot_results(global_best_scores, best_scores, mean_scores)
+        if enable_inter_route:
+            best = np.argsort(self.evaluate(offspring, decode=False)[:, 0], kind="stable")
+            best = best[:int(np.ceil(self.INTER_ROUTE_SEARCH_RATE * len(offspring)))]
+            offspring[best] = self.inter_route_search_for_population(offspring[best])
+        if enable_2_opt:
+            self.two_opt_for_population(offspring)
+        new_result[len(elite):] = self.evaluate(offspring, decode=False)
+        return new_pop, new_result
 
-        return best_solution, best_distance, best_time, best_score, global_best_scores
+    def next_buffers(self, pop, result):
+        index = 1 if self._buffers.get("population0") is pop else 0
+        return (self.buffer(f"population{index}", pop.shape, pop.dtype),
+                self.buffer(f"result{index}", result.shape, result.dtype))
+
+    def buffer(self, name, shape, dtype):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype)
+        return buffer
+
+    @property
+    def genome_dtype(self):
+        max_gene = self.customer_count + self.vehicle_count - 1
+        return next(dtype for dtype in (np.int16, np.int32, np.int64) if max_gene <= np.iinfo(dtype).max)
 
     def generate_population(self, size):
-        return np.array([np.random.permutation(self.customer_count + self.vehicle_count - 1) + 1 for _ in range(size)])
+        genes = np.arange(1, self.customer_count + self.vehicle_count, dtype=self.genome_dtype)
+        return self.rng.permuted(np.tile(genes, (size, 1)), axis=1)
 
     def decode_individual(self, row):
         solution = []
         routes = []
-        for value in row:
+        for value in row.tolist():
             if value > self.customer_count:
                 solution.append(routes)
                 routes = []
@@ -78,9 +135,21 @@ class GA:
 
         return np.array(individual[:-1])
 
-    def evaluate(self, population):
+    def evaluate(self, population, decode=True):
+        if self.fitness_cache is not None:
+            result = self.fitness_cache.evaluate(population, self.evaluate_population)
+        else:
+            result = self.evaluate_population(population)
+        return (result, [self.decode_individual(row) for row in population]) if decode else result
+
+    def evaluate_population(self, population):
+        if self.distance_matrix is not None and self.backend == self.NUMBA:
+            return kernels.evaluate(population, self.distance_matrix, self.customer_count, self.distance_factor,
+                                    self.time_factor)
+        if self.distance_matrix is not None:
+            return self.evaluate_batch(population)
+
         evaluated_pop = []
-        decoded = []
         for row in population:
             solution = self.decode_individual(row)
             distances = [self.calculate_distance_func(np.array(vehicle)) for vehicle in solution]
@@ -90,46 +159,103 @@ class GA:
             score = self.calculate_score(total_distance, time)
 
             evaluated_pop.append([score, total_distance, time])
-            decoded.append(solution)
 
-        return np.array(evaluated_pop), decoded
+        return np.array(evaluated_pop).reshape(-1, 3)
+
+    def evaluate_batch(self, population):
+        num_individuals, num_genes = population.shape
+        is_separator = population > self.customer_count
+
+        paths = np.zeros((num_individuals, num_genes + 2), dtype=population.dtype)
+        paths[:, 1:-1] = np.where(is_separator, 0, population)
+        edge_distances = self.distance_matrix[paths[:, :-1], paths[:, 1:]]
+
+        route_ids = np.zeros((num_individuals, num_genes + 1), dtype=np.intp)
+        np.cumsum(is_separator, axis=1, out=route_ids[:, 1:])
+        route_ids += np.arange(num_individuals)[:, np.newaxis] * self.vehicle_count
+        route_distances = np.bincount(route_ids.ravel(), weights=edge_distances.ravel(),
+                                      minlength=num_individuals * self.vehicle_count)
+        route_distances = route_distances.reshape(num_individuals, self.vehicle_count)
+
+        total_distance = route_distances.sum(axis=1)
+        time = route_distances.max(axis=1)
+        score = self.calculate_score(total_distance, time)
+
+        return np.column_stack((score, total_distance, time))
 
     def calculate_score(self, total_distance, time):
         return self.distance_factor * total_distance + self.time_factor * time
 
-    @staticmethod
-    def selection(population, scores):
-        inverted_scores = 1 / scores
-        probabilities = inverted_scores / np.sum(inverted_scores)
-        selected_indices = np.random.choice(len(population), p=probabilities, size=len(population))
+    def selection(self, population, scores, selection_method=roulette_wheel_selection, size=None, out=None):
+        size = (len(population) if out is None else len(out)) if size is None else size
+        return np.take(population, selection_method(scores, size, self.rng), axis=0, out=out)
 
-        return population[selected_indices]
+    def crossover(self, population, crossover_method, p=1.):
+        first = np.arange(0, len(population) - 1, 2)
+        first = first[self.rng.random(len(first)) < p]
+        second = first + 1
 
-    @staticmethod
-    def crossover(population, crossover_method, p=1.):
-        new_pop = np.copy(population)
-        num_individuals, num_genes = new_pop.shape
-        for i in range(0, num_individuals - 1, 2):
-            if np.random.uniform() < p:
-                new_pop[i], new_pop[i + 1] = crossover_method(new_pop[i], new_pop[i + 1])
+        if crossover_method in BATCH_CROSSOVERS:
+            shape = (len(first), population.shape[1])
+            out = self.buffer("offspring1", shape, population.dtype), self.buffer("offspring2", shape, population.dtype)
+            population[first], population[second] = BATCH_CROSSOVERS[crossover_method](
+                population[first], population[second], self.rng, out)
+        else:
+            if self.backend == self.NUMBA:
+                crossover_method = kernels.CROSSOVERS.get(crossover_method, crossover_method)
+            for i, j in zip(first, second):
+                population[i], population[j] = crossover_method(population[i].copy(), population[j].copy(), self.rng)
 
-        return new_pop
+        return population
 
-    @staticmethod
-    def mutation(population, p=1.):
-        new_pop = population.copy()
-        num_individuals, num_genes = new_pop.shape
+    def mutation(self, population, p=1.):
+        num_individuals, num_genes = population.shape
         if num_genes > 1:
-            for i in range(num_individuals):
-                if np.random.uniform() < p:
-                    shuffle_mutation(new_pop[i])
-        return new_pop
+            batch_shuffle_mutation(population, self.rng, self.rng.random(num_individuals) < p)
+        return population
+
+    def inter_route_search_for_population(self, population):
+        for row in population:
+            row[:] = self.encode_solution(inter_route_search(self.decode_individual(row), self.search_distance_matrix,
+                                                             self.distance_factor, self.time_factor))
+        return population
 
     def two_opt_for_population(self, population):
-        return np.array([self.encode_solution([self.two_opt(route) for route in self.decode_individual(row)])
-                         for row in population])
+        for row in population:
+            row[:] = self.encode_solution([self.two_opt(route) for route in self.decode_individual(row)])
+        return population
+
+    @property
+    def cache_stats(self):
+        return {"fitness": self.fitness_cache.stats} if self.fitness_cache is not None else {}
+
+    @property
+    def neighbors(self):
+        if self._neighbors is None:
+            self._neighbors = nearest_neighbors(self.distance_matrix, self.NEIGHBOR_COUNT * self.vehicle_count)
+        return self._neighbors
+
+    @property
+    def search_distance_matrix(self):
+        if self._search_distance_matrix is None:
+            self._search_distance_matrix = np.asarray(self.distance_matrix, dtype=np.float64)
+        return self._search_distance_matrix
+
+    @property
+    def is_symmetric(self):
+        if self._is_symmetric is None:
+            self._is_symmetric = self.distance_matrix is not None and np.allclose(self.distance_matrix,
+                                                                                  self.distance_matrix.T)
+        return self._is_symmetric
 
     def two_opt(self, route):
+        if self.is_symmetric and self.backend == self.NUMBA:
+            return kernels.two_opt(np.array(route), self.distance_matrix).tolist()
+        if self.is_symmetric:
+            return neighbor_two_opt(route, self.distance_matrix, self.neighbors)
+        if self.distance_matrix is not None:
+            return asymmetric_local_search(route, self.distance_matrix)
+
         best_distance = self.calculate_distance_func(np.array(route))
         improved = True
         while improved:
@@ -146,10 +272,44 @@ class GA:
 
     def validate(self):
         if self.customer_count <= 0 or self.vehicle_count <= 0 or (
-                self.distance_factor == 0 and self.time_factor == 0) or not self.calculate_distance_func:
+                self.distance_factor == 0 and self.time_factor == 0) or not self.calculate_distance_func or \
+                self.backend not in self.BACKENDS:
             raise ValueError("Incorrect parameters")
 
     @staticmethod
-    def validate_evolve(size, generations):
-        if size <= 0 or generations <= 0:
+    def validate_evolve(size, generations, elite_count=0):
+        if size <= 0 or generations <= 0 or not 0 <= elite_count < size:
             raise ValueError("Incorrect parameters")
+
+
+class EvolutionStep:
+
+    def __init__(self, generation, best_score, mean_score, global_best_score, solution=None, distance=None, time=None,
+                 stop_reason=None):
+        self.generation = generation
+        self.best_score = best_score
+        self.mean_score = mean_score
+        self.global_best_score = global_best_score
+        self.solution = solution
+        self.distance = distance
+        self.time = time
+        self.stop_reason = stop_reason
+
+    @property
+    def improved(self):
+        return self.solution is not None
+
+
+def collect_evolution(steps, show_plot=True):
+    global_best_scores, best_scores, mean_scores = [], [], []
+    for step in steps:
+        if step.improved:
+            best_solution, best_distance, best_time = step.solution, step.distance, step.time
+        global_best_scores.append(step.global_best_score)
+        best_scores.append(step.best_score)
+        mean_scores.append(step.mean_score)
+
+    if show_plot:
+        plot_results(global_best_scores, best_scores, mean_scores)
+
+    return best_solution, best_distance, best_time, global_best_scores[-1], global_best_scores, step.stop_reason
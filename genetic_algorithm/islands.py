@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from genetic_algorithm.cache import FitnessCache
+from genetic_algorithm.ga import GA, EvolutionStep, collect_evolution
+from genetic_algorithm.stopping import Cancellation, StoppingCriteria
+from genetic_algorithm.strategies import order_crossover, roulette_wheel_selection
+
+_shared_distance_memory = None
+_shared_distance_matrix = None
+_fitness_cache = None
+_cancellation = None
+
+
+class IslandGA:
+    RING = "ring"
+    RANDOM = "random"
+    TOPOLOGIES = (RING, RANDOM)
+    CANCELLATION_POLL_INTERVAL = 0.1
+
+    def __init__(self, ga: GA, islands, migration_interval, migration_size=2, topology=RING, max_workers=None):
+        self.ga = ga
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.max_workers = max_workers
+        self.validate()
+
+    def evolve(self, size, generations, pc, pm, crossover_method=order_crossover, enable_2_opt=False, show_plot=True,
+               enable_inter_route=False, selection_method=roulette_wheel_selection, elite_count=0, time_limit=None,
+               stall_limit=None, target_score=None, cancellation=None):
+        return collect_evolution(self.evolve_iter(size, generations, pc, pm, crossover_method, enable_2_opt,
+                                                  enable_inter_route, selection_method, elite_count, time_limit,
+                                                  stall_limit, target_score, cancellation), show_plot)
+
+    def evolve_iter(self, size, generations, pc, pm, crossover_method=order_crossover, enable_2_opt=False,
+                    enable_inter_route=False, selection_method=roulette_wheel_selection, elite_count=0,
+                    time_limit=None, stall_limit=None, target_score=None, cancellation=None):
+        self.ga.validate_evolve(size, generations, elite_count)
+        stopping_criteria = StoppingCriteria(generations, time_limit, stall_limit, target_score, cancellation)
+        populations = [self.ga.generate_population(size) for _ in range(self.islands)]
+        results = [self.ga.evaluate(pop, decode=False) for pop in populations]
+
+        best_index, min_index = self.find_best(results)
+        best_score, best_distance, best_time = results[best_index][min_index]
+        global_best_scores = [best_score]
+        stop_reason = stopping_criteria.check(global_best_scores)
+        yield EvolutionStep(0, best_score, np.mean([result[:, 0] for result in results]), best_score,
+                            self.ga.decode_individual(populations[best_index][min_index]), best_distance, best_time,
+                            stop_reason)
+        if stop_reason is not None:
+            return
+
+        matrix = self.ga.distance_matrix
+        memory = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=memory.buf)[:] = matrix
+            ga_params = (self.ga.customer_count, self.ga.vehicle_count, self.ga.distance_factor, self.ga.time_factor)
+            max_workers = self.max_workers or min(self.islands, os.cpu_count() or 1)
+            fitness_cache_size = self.ga.fitness_cache.max_size if self.ga.fitness_cache is not None else None
+            stopping_params = (generations, time_limit, stall_limit, target_score, stopping_criteria.start_time)
+            stop_event = multiprocessing.Event()
+
+            with ProcessPoolExecutor(max_workers, initializer=_attach_distance_matrix,
+                                     initargs=(memory.name, matrix.shape, matrix.dtype, fitness_cache_size,
+                                               stop_event)) as executor:
+                while stop_reason is None:
+                    epoch = min(self.migration_interval, generations - len(global_best_scores) + 1)
+                    seeds = self.ga.rng.integers(np.iinfo(np.int32).max, size=self.islands)
+                    futures = [executor.submit(_evolve_island, ga_params, pop, result, epoch, seed, pc, pm,
+                                               crossover_method, enable_2_opt, enable_inter_route, selection_method,
+                                               elite_count, stopping_params, global_best_scores, self.ga.backend)
+                               for pop, result, seed in zip(populations, results, seeds)]
+                    self.wait_for_islands(futures, cancellation, stop_event)
+                    populations, results, island_best_scores, island_mean_scores, island_bests, cache_counts = zip(
+                        *(future.result() for future in futures))
+                    populations, results = list(populations), list(results)
+                    self.add_cache_counts(cache_counts)
+
+                    steps = []
+                    for generation_best, generation_mean in zip(np.min(_pad(island_best_scores), axis=0),
+                                                                np.mean(_pad(island_mean_scores), axis=0)):
+                        global_best_scores.append(min(global_best_scores[-1], generation_best))
+                        steps.append(EvolutionStep(len(global_best_scores) - 1, generation_best, generation_mean,
+                                                   global_best_scores[-1]))
+
+                    individual, result = min(island_bests, key=lambda island_best: island_best[1][0])
+                    if best_score > result[0]:
+                        best_score, steps[-1].distance, steps[-1].time = result
+                        steps[-1].solution = self.ga.decode_individual(individual)
+
+                    stop_reason = stopping_criteria.check(global_best_scores)
+                    steps[-1].stop_reason = stop_reason
+                    yield from steps
+
+                    if stop_reason is None:
+                        self.migrate(populations, results)
+        finally:
+            memory.close()
+            memory.unlink()
+
+    def migrate(self, populations, results):
+        k = min(self.migration_size, len(populations[0]))
+        if k == 0:
+            return
+
+        emigrants = []
+        for pop, result in zip(populations, results):
+            best = np.argsort(result[:, 0])[:k]
+            emigrants.append((pop[best].copy(), result[best].copy()))
+
+        sources = np.roll(np.arange(self.islands), 1) if self.topology == self.RING \
+            else self.ga.rng.permutation(self.islands)
+        for target, source in enumerate(sources):
+            if target == source:
+                continue
+            worst = np.argsort(results[target][:, 0])[-k:]
+            populations[target][worst], results[target][worst] = emigrants[source]
+
+    def wait_for_islands(self, futures, cancellation, stop_event):
+        if cancellation is None:
+            return
+        while wait(futures, self.CANCELLATION_POLL_INTERVAL).not_done:
+            if cancellation.cancelled:
+                stop_event.set()
+
+    def add_cache_counts(self, cache_counts):
+        if self.ga.fitness_cache is not None:
+            hits, misses = np.sum(cache_counts, axis=0, dtype=int)
+            self.ga.fitness_cache.hits += int(hits)
+            self.ga.fitness_cache.misses += int(misses)
+
+    @property
+    def cache_stats(self):
+        return self.ga.cache_stats
+
+    @staticmethod
+    def find_best(results):
+        best_index = int(np.argmin([np.min(result[:, 0]) for result in results]))
+        return best_index, int(np.argmin(results[best_index][:, 0]))
+
+    def validate(self):
+        if self.islands <= 0 or self.migration_interval <= 0 or self.migration_size < 0 or \
+                self.topology not in self.TOPOLOGIES or self.ga.distance_matrix is None:
+            raise ValueError("Incorrect parameters")
+
+
+def _attach_distance_matrix(name, shape, dtype, fitness_cache_size=None, stop_event=None):
+    global _shared_distance_memory, _shared_distance_matrix, _fitness_cache, _cancellation
+    _shared_distance_memory = shared_memory.SharedMemory(name=name)
+    _shared_distance_matrix = np.ndarray(shape, dtype=dtype, buffer=_shared_distance_memory.buf)
+    _fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size is not None else None
+    _cancellation = Cancellation(stop_event) if stop_event is not None else None
+
+
+def _calculate_total_distance(routes):
+    return np.sum(_shared_distance_matrix[routes[:-1], routes[1:]])
+
+
+def _pad(island_scores):
+    length = max(len(scores) for scores in island_scores)
+    return [np.pad(scores, (0, length - len(scores)), mode="edge") for scores in island_scores]
+
+
+def _evolve_island(ga_params, pop, result, generations, seed, pc, pm, crossover_method, enable_2_opt,
+                   enable_inter_route, selection_method, elite_count, stopping_params, global_best_scores,
+                   backend=GA.NUMPY):
+    ga = GA(*ga_params, _calculate_total_distance, _shared_distance_matrix, np.random.default_rng(seed), _fitness_cache,
+            backend=backend)
+    stopping_criteria = StoppingCriteria(*stopping_params[:4], _cancellation, stopping_params[4])
+    global_best_scores = list(global_best_scores)
+    best_scores, mean_scores = [], []
+    best = None
+    hits, misses = (_fitness_cache.hits, _fitness_cache.misses) if _fitness_cache is not None else (0, 0)
+
+    for _ in range(generations):
+        pop, result = ga.evolve_generation(pop, result, pc, pm, crossover_method, enable_2_opt, enable_inter_route,
+                                           selection_method, elite_count)
+        scores = result[:, 0]
+        min_index = np.argmin(scores)
+        best_scores.append(scores[min_index])
+        mean_scores.append(np.mean(scores))
+
+        if best is None or best[1][0] > scores[min_index]:
+            best = pop[min_index].copy(), result[min_index].copy()
+
+        global_best_scores.append(min(global_best_scores[-1], scores[min_index]))
+        stop_reason = stopping_criteria.check(global_best_scores)
+        if stop_reason == StoppingCriteria.TARGET_SCORE and _cancellation is not None:
+            _cancellation.cancel()
+        if stop_reason is not None:
+            break
+
+    cache_counts = (_fitness_cache.hits - hits, _fitness_cache.misses - misses) if _fitness_cache is not None \
+        else (0, 0)
+    return pop, result, best_scores, mean_scores, best, cache_counts
@@ -0,0 +1,166 @@
+import numpy as np
+
+from genetic_algorithm import strategies
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def _jit(func):
+    return njit(cache=True)(func) if NUMBA_AVAILABLE else func
+
+
+@_jit
+def evaluate(population, distance_matrix, customer_count, distance_factor, time_factor):
+    result = np.empty((population.shape[0], 3))
+    for row in range(population.shape[0]):
+        total_distance = 0.
+        time = 0.
+        route_distance = 0.
+        previous = 0
+        for gene in population[row]:
+            node = gene if gene <= customer_count else 0
+            route_distance += distance_matrix[previous, node]
+            if gene > customer_count:
+                total_distance += route_distance
+                time = max(time, route_distance)
+                route_distance = 0.
+            previous = node
+        route_distance += distance_matrix[previous, 0]
+        total_distance += route_distance
+        time = max(time, route_distance)
+
+        result[row, 0] = distance_factor * total_distance + time_factor * time
+        result[row, 1] = total_distance
+        result[row, 2] = time
+    return result
+
+
+@_jit
+def two_opt(route, distance_matrix):
+    d = distance_matrix
+    size = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(size - 3):
+            for j in range(i + 2, size - 1 if i > 0 else size - 2):
+                removed = float(d[route[i], route[i + 1]]) + float(d[route[j], route[j + 1]])
+                added = float(d[route[i], route[j]]) + float(d[route[i + 1], route[j + 1]])
+                if added - removed < -IMPROVEMENT_EPSILON * max(removed, 1.):
+                    route[i + 1:j + 1] = route[i + 1:j + 1][::-1].copy()
+                    improved = True
+    return route
+
+
+@_jit
+def _inverse_permutation(permutation):
+    inverse = np.empty(permutation.max() + 1, dtype=np.intp)
+    for index in range(len(permutation)):
+        inverse[permutation[index]] = index
+    return inverse
+
+
+@_jit
+def _cycle_mask(parent1, parent2):
+    size = len(parent1)
+    position1 = _inverse_permutation(parent1)
+    from_first = np.zeros(size, dtype=np.bool_)
+    visited = np.zeros(size, dtype=np.bool_)
+    use_first = True
+
+    for start in range(size):
+        if visited[start]:
+            continue
+
+        index = start
+        while not visited[index]:
+            visited[index] = True
+            from_first[index] = use_first
+            index = position1[parent2[index]]
+
+        use_first = not use_first
+
+    return from_first
+
+
+@_jit
+def _partially_mapped_offspring(p1, p2, cx1, cx2):
+    position1 = _inverse_permutation(p1)
+    offspring = p2.copy()
+    offspring[cx1:cx2] = p1[cx1:cx2]
+
+    for i in range(len(p1)):
+        if cx1 <= i < cx2:
+            continue
+        candidate = p2[i]
+        while cx1 <= position1[candidate] < cx2:
+            candidate = p2[position1[candidate]]
+        offspring[i] = candidate
+    return offspring
+
+
+@_jit
+def _edge_recombination_offspring(parent, edges, randoms):
+    missing = parent[1:].copy()
+    missing_count = len(missing)
+    missing_index = np.zeros(len(edges), dtype=np.intp)
+    is_missing = np.zeros(len(edges), dtype=np.bool_)
+    for index in range(missing_count):
+        missing_index[missing[index]] = index
+        is_missing[missing[index]] = True
+
+    offspring = np.empty_like(parent)
+    node = parent[0]
+    offspring[0] = node
+    nodes = np.empty(edges.shape[1], dtype=parent.dtype)
+
+    for step in range(len(randoms)):
+        count = 0
+        for v in edges[node]:
+            if is_missing[v]:
+                nodes[count] = v
+                count += 1
+        node = nodes[int(randoms[step] * count)] if count else missing[int(randoms[step] * missing_count)]
+        offspring[step + 1] = node
+
+        missing_count -= 1
+        last = missing[missing_count]
+        if last != node:
+            missing[missing_index[node]] = last
+            missing_index[last] = missing_index[node]
+        is_missing[node] = False
+
+    return offspring
+
+
+def cycle_crossover(parent1, parent2, rng=np.random):
+    from_first = _cycle_mask(parent1, parent2)
+    return np.where(from_first, parent1, parent2), np.where(from_first, parent2, parent1)
+
+
+def partially_mapped_crossover(parent1, parent2, rng=np.random):
+    cx1, cx2 = np.sort(rng.choice(len(parent1) + 1, 2, replace=False))
+    return (_partially_mapped_offspring(parent1, parent2, cx1, cx2),
+            _partially_mapped_offspring(parent2, parent1, cx1, cx2))
+
+
+def edge_recombination_crossover(parent1, parent2, rng=np.random):
+    size = len(parent1)
+    j = strategies._inverse_permutation(parent2)[parent1]
+    edges = np.empty((max(parent1.max(), parent2.max()) + 1, 4), dtype=parent1.dtype)
+    edges[parent1] = np.column_stack([np.roll(parent1, 1), np.roll(parent1, -1),
+                                      parent2[(j - 1) % size], parent2[(j + 1) % size]])
+    randoms1, randoms2 = rng.random(size - 1), rng.random(size - 1)
+    return (_edge_recombination_offspring(parent1, edges, randoms1),
+            _edge_recombination_offspring(parent2, edges, randoms2))
+
+
+CROSSOVERS = {strategies.cycle_crossover: cycle_crossover,
+              strategies.partially_mapped_crossover: partially_mapped_crossover,
+              strategies.edge_recombination_crossover: edge_recombination_crossover}
@@ -0,0 +1,245 @@
+from collections import deque
+from itertools import combinations
+
+import numpy as np
+
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def nearest_neighbors(distance_matrix, k):
+    size = len(distance_matrix)
+    k = min(k, size - 1)
+    if k <= 0:
+        return np.empty((size, 0), dtype=int)
+
+    distances = np.array(distance_matrix, dtype=float)
+    np.fill_diagonal(distances, np.inf)
+    candidates = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(distances, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def route_neighbors(nodes, distance_matrix):
+    nodes = np.asarray(nodes)
+    order = np.argsort(distance_matrix[np.ix_(nodes, nodes)], axis=1)[:, 1:]
+    return dict(zip(nodes.tolist(), nodes[order].tolist()))
+
+
+def neighbor_two_opt(route, distance_matrix, neighbors, first_improvement=True):
+    route = list(route)
+    if len(route) < 4:
+        return route
+
+    d = distance_matrix
+    position = {node: index for index, node in enumerate(route[1:-1], 1)}
+    candidates = route_neighbors(route[1:-1], d) if len(position) <= neighbors.shape[1] else neighbors
+    queue = deque(position)
+    active = set(position)
+
+    while queue:
+        node = queue.popleft()
+        active.discard(node)
+        move = _find_two_opt_move(route, position, d, candidates[node], position[node], first_improvement)
+        if move is None:
+            continue
+
+        i, j = move
+        route[i:j + 1] = route[i:j + 1][::-1]
+        for index in range(i, j + 1):
+            position[route[index]] = index
+        for endpoint in (route[i - 1], route[i], route[j], route[j + 1]):
+            if endpoint in position and endpoint not in active:
+                active.add(endpoint)
+                queue.append(endpoint)
+
+    return route
+
+
+def _find_two_opt_move(route, position, d, candidates, k, first_improvement):
+    u = route[k]
+    succ_u, pred_u = route[k + 1], route[k - 1]
+    max_gain_edge = max(d[u, succ_u], d[pred_u, u])
+    best_move, best_delta = None, -IMPROVEMENT_EPSILON
+
+    for v in candidates:
+        new_edge = d[u, v]
+        if new_edge >= max_gain_edge:
+            break
+        m = position.get(v)
+        if m is None:
+            continue
+
+        for a, b in ((k, m), (k - 1, m - 1)):
+            i, j = (a, b) if a < b else (b, a)
+            if j - i < 2:
+                continue
+            delta = (d[route[i], route[j]] + d[route[i + 1], route[j + 1]] -
+                     d[route[i], route[i + 1]] - d[route[j], route[j + 1]])
+            if delta < best_delta:
+                best_move, best_delta = (i + 1, j), delta
+                if first_improvement:
+                    return best_move
+
+    return best_move
+
+
+def asymmetric_local_search(route, distance_matrix, max_segment_length=3):
+    route = np.array(route)
+    if len(route) < 4:
+        return route.tolist()
+
+    while True:
+        moves = [_best_reversal_move(route, distance_matrix)]
+        moves += [_best_relocation_move(route, distance_matrix, length) for length in range(1, max_segment_length + 1)]
+        delta, apply_move = min(moves, key=lambda move: move[0])
+        if delta >= -IMPROVEMENT_EPSILON:
+            return route.tolist()
+        route = apply_move()
+
+
+def _best_reversal_move(route, d):
+    n = len(route)
+    if n < 4:
+        return 0., None
+
+    forward, backward = d[route[:-1], route[1:]], d[route[1:], route[:-1]]
+    forward_sums = np.concatenate(([0.], np.cumsum(forward)))
+    backward_sums = np.concatenate(([0.], np.cumsum(backward)))
+
+    i, j = np.arange(1, n - 2)[:, np.newaxis], np.arange(2, n - 1)
+    deltas = (d[route[i - 1], route[j]] + d[route[i], route[j + 1]] - forward[i - 1] - forward[j] +
+              (backward_sums[j] - backward_sums[i]) - (forward_sums[j] - forward_sums[i]))
+    deltas = np.where(j > i, deltas, np.inf)
+
+    best_i, best_j = np.unravel_index(np.argmin(deltas), deltas.shape)
+    i, j = best_i + 1, best_j + 2
+
+    def apply_move():
+        new_route = route.copy()
+        new_route[i:j + 1] = route[i:j + 1][::-1]
+        return new_route
+
+    return deltas[best_i, best_j], apply_move
+
+
+def _best_relocation_move(route, d, length):
+    n = len(route)
+    if n - 2 <= length:
+        return 0., None
+
+    i, p = np.arange(1, n - length)[:, np.newaxis], np.arange(n - 1)
+    first, last = route[i], route[i + length - 1]
+    before, after = route[i - 1], route[i + length]
+    deltas = (d[before, after] + d[route[p], first] + d[last, route[p + 1]] -
+              d[before, first] - d[last, after] - d[route[p], route[p + 1]])
+    deltas = np.where((p < i - 1) | (p > i + length - 1), deltas, np.inf)
+
+    best_i, p = np.unravel_index(np.argmin(deltas), deltas.shape)
+    i = best_i + 1
+
+    def apply_move():
+        segment = route[i:i + length]
+        if p < i:
+            return np.concatenate((route[:p + 1], segment, route[p + 1:i], route[i + length:]))
+        return np.concatenate((route[:i], route[i + length:p + 1], segment, route[p + 1:]))
+
+    return deltas[best_i, p], apply_move
+
+
+def inter_route_search(solution, distance_matrix, distance_factor, time_factor, max_segment_length=2):
+    d = np.asarray(distance_matrix, dtype=np.float64)
+    routes = [np.array(route) if len(route) > 1 else np.zeros(2, dtype=int) for route in solution]
+    prefixes = [_prefix_costs(route, d) for route in routes]
+    costs = np.array([prefix[-1] for prefix in prefixes])
+    pairs = list(combinations(range(len(routes)), 2))
+    queue = deque(pairs)
+    queued = set(pairs)
+
+    while queue:
+        a, b = queue.popleft()
+        queued.discard((a, b))
+        move = _find_inter_route_move(routes, prefixes, costs, a, b, d, distance_factor, time_factor,
+                                      max_segment_length)
+        if move is None:
+            continue
+
+        max_cost = np.max(costs)
+        routes[a], routes[b] = move
+        prefixes[a], prefixes[b] = _prefix_costs(routes[a], d), _prefix_costs(routes[b], d)
+        costs[a], costs[b] = prefixes[a][-1], prefixes[b][-1]
+
+        changed = range(len(routes)) if time_factor and np.max(costs) != max_cost else (a, b)
+        for pair in pairs:
+            if pair not in queued and (pair[0] in changed or pair[1] in changed):
+                queued.add(pair)
+                queue.append(pair)
+
+    return [route.tolist() if len(route) > 2 else [0] for route in routes]
+
+
+def _find_inter_route_move(routes, prefixes, costs, a, b, d, distance_factor, time_factor, max_segment_length):
+    total = np.sum(costs)
+    score = distance_factor * total + time_factor * np.max(costs)
+    other_costs = np.delete(costs, [a, b])
+    max_other = np.max(other_costs) if other_costs.size else -np.inf
+    threshold = -IMPROVEMENT_EPSILON * max(abs(score), 1.)
+
+    for new_cost_a, new_cost_b, apply_move in _inter_route_moves(routes[a], routes[b], prefixes[a], prefixes[b], d,
+                                                                  max_segment_length):
+        if apply_move is None:
+            continue
+        new_scores = (distance_factor * (total - costs[a] - costs[b] + new_cost_a + new_cost_b) +
+                      time_factor * np.maximum(max_other, np.maximum(new_cost_a, new_cost_b)))
+        index = np.unravel_index(np.argmin(new_scores), new_scores.shape)
+        if new_scores[index] - score < threshold:
+            return apply_move(*index)
+    return None
+
+
+def _inter_route_moves(route_a, route_b, prefix_a, prefix_b, d, max_segment_length):
+    yield _best_two_opt_star_move(route_a, route_b, prefix_a, prefix_b, d)
+    for length_a in range(max_segment_length + 1):
+        for length_b in range(max_segment_length + 1):
+            if length_a or length_b:
+                yield _best_cross_exchange_move(route_a, route_b, prefix_a, prefix_b, d, length_a, length_b)
+
+
+def _prefix_costs(route, d):
+    return np.concatenate(([0.], np.cumsum(d[route[:-1], route[1:]])))
+
+
+def _best_two_opt_star_move(route_a, route_b, prefix_a, prefix_b, d):
+    i, j = np.arange(len(route_a) - 1)[:, np.newaxis], np.arange(len(route_b) - 1)
+    new_cost_a = prefix_a[i] + d[route_a[i], route_b[j + 1]] + prefix_b[-1] - prefix_b[j + 1]
+    new_cost_b = prefix_b[j] + d[route_b[j], route_a[i + 1]] + prefix_a[-1] - prefix_a[i + 1]
+
+    def apply_move(i, j):
+        return (np.concatenate((route_a[:i + 1], route_b[j + 1:])),
+                np.concatenate((route_b[:j + 1], route_a[i + 1:])))
+
+    return new_cost_a, new_cost_b, apply_move
+
+
+def _best_cross_exchange_move(route_a, route_b, prefix_a, prefix_b, d, length_a, length_b):
+    if len(route_a) - 1 - length_a < 1 or len(route_b) - 1 - length_b < 1:
+        return None, None, None
+
+    i, j = np.arange(1, len(route_a) - length_a)[:, np.newaxis], np.arange(1, len(route_b) - length_b)
+    new_cost_a = prefix_a[-1] - (prefix_a[i + length_a] - prefix_a[i - 1]) + _insertion_cost(
+        route_a[i - 1], route_a[i + length_a], route_b, prefix_b, j, length_b, d)
+    new_cost_b = prefix_b[-1] - (prefix_b[j + length_b] - prefix_b[j - 1]) + _insertion_cost(
+        route_b[j - 1], route_b[j + length_b], route_a, prefix_a, i, length_a, d)
+
+    def apply_move(i, j):
+        i, j = i + 1, j + 1
+        return (np.concatenate((route_a[:i], route_b[j:j + length_b], route_a[i + length_a:])),
+                np.concatenate((route_b[:j], route_a[i:i + length_a], route_b[j + length_b:])))
+
+    return new_cost_a, new_cost_b, apply_move
+
+
+def _insertion_cost(previous, following, route, prefix, start, length, d):
+    if length == 0:
+        return d[previous, following]
+    end = start + length - 1
+    return d[previous, route[start]] + prefix[end] - prefix[start] + d[route[end], following]
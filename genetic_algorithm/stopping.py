@@ -0,0 +1,57 @@
+from threading import Event
+from time import time
+
+
+class Cancellation:
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class StoppingCriteria:
+    GENERATIONS = "generations"
+    TIME_LIMIT = "time limit"
+    STALL_LIMIT = "stall limit"
+    TARGET_SCORE = "target score"
+    CANCELLED = "cancelled"
+
+    def __init__(self, generations, time_limit=None, stall_limit=None, target_score=None, cancellation=None,
+                 start_time=None):
+        self.generations = generations
+        self.time_limit = time_limit
+        self.stall_limit = stall_limit
+        self.target_score = target_score
+        self.cancellation = cancellation
+        self.start_time = time() if start_time is None else start_time
+        self.validate()
+
+    @property
+    def deadline(self):
+        return None if self.time_limit is None else self.start_time + self.time_limit
+
+    def check(self, global_best_scores):
+        generation = len(global_best_scores) - 1
+        if self.cancellation is not None and self.cancellation.cancelled:
+            return self.CANCELLED
+        if self.target_score is not None and global_best_scores[-1] <= self.target_score:
+            return self.TARGET_SCORE
+        if generation >= self.generations:
+            return self.GENERATIONS
+        if self.time_limit is not None and time() >= self.deadline:
+            return self.TIME_LIMIT
+        if self.stall_limit is not None and generation >= self.stall_limit and \
+                global_best_scores[-1] >= global_best_scores[-1 - self.stall_limit]:
+            return self.STALL_LIMIT
+        return None
+
+    def validate(self):
+        if (self.time_limit is not None and self.time_limit <= 0) or \
+                (self.stall_limit is not None and self.stall_limit <= 0):
+            raise ValueError("Incorrect parameters")
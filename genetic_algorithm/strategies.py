@@ -1,14 +1,14 @@
 import numpy as np
 
 
-def order_crossover(parent1, parent2):
+def order_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    cx1, cx2 = np.sort(np.random.choice(size + 1, 2, replace=False))
+    cx1, cx2 = np.sort(rng.choice(size + 1, 2, replace=False))
 
     missing1 = parent2[~np.isin(parent2, parent1[cx1:cx2])]
     missing2 = parent1[~np.isin(parent1, parent2[cx1:cx2])]
 
-    offspring1, offspring2 = np.empty(size, dtype=int), np.empty(size, dtype=int)
+    offspring1, offspring2 = np.empty_like(parent1), np.empty_like(parent2)
 
     offspring1[:cx1] = missing1[:cx1]
     offspring2[:cx1] = missing2[:cx1]
@@ -20,14 +20,14 @@ def order_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def order_based_crossover(parent1, parent2):
+def order_based_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    selected = np.random.choice([True, False], size)
+    selected = rng.choice([True, False], size)
 
     matching1 = np.isin(parent2, parent1[selected])
     matching2 = np.isin(parent1, parent2[selected])
 
-    offspring1, offspring2 = np.empty(size, dtype=int), np.empty(size, dtype=int)
+    offspring1, offspring2 = np.empty_like(parent1), np.empty_like(parent2)
 
     offspring1[matching1] = parent1[selected]
     offspring2[matching2] = parent2[selected]
@@ -37,11 +37,11 @@ def order_based_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def position_based_crossover(parent1, parent2):
+def position_based_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    selected = np.random.choice([True, False], size)
+    selected = rng.choice([True, False], size)
 
-    offspring1, offspring2 = np.empty(size, dtype=int), np.empty(size, dtype=int)
+    offspring1, offspring2 = np.empty_like(parent1), np.empty_like(parent2)
 
     offspring1[selected] = parent1[selected]
     offspring2[selected] = parent2[selected]
@@ -51,91 +51,207 @@ def position_based_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def cycle_crossover(parent1, parent2):
+def cycle_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    offspring1, offspring2 = np.empty(size, dtype=int), np.empty(size, dtype=int)
-    visited = np.zeros(size, dtype=bool)
-    source1, source2 = parent1, parent2
+    position1 = _inverse_permutation(parent1).tolist()
+    genes2 = parent2.tolist()
+    from_first = np.zeros(size, dtype=bool)
+    visited = [False] * size
+    use_first = True
 
     for start in range(size):
         if visited[start]:
             continue
-        visited[start] = True
-        cycle = [start]
 
-        while parent2[cycle[-1]] != parent1[start]:
-            next_index = np.where(parent1 == parent2[cycle[-1]])[0][0]
-            cycle.append(next_index)
-            visited[next_index] = True
+        index = start
+        while not visited[index]:
+            visited[index] = True
+            from_first[index] = use_first
+            index = position1[genes2[index]]
 
-        cycle = np.array(cycle)
-        offspring1[cycle] = source1[cycle]
-        offspring2[cycle] = source2[cycle]
+        use_first = not use_first
 
-        source1, source2 = source2, source1
-
-    return offspring1, offspring2
+    return np.where(from_first, parent1, parent2), np.where(from_first, parent2, parent1)
 
 
-def partially_mapped_crossover(parent1, parent2):
+def partially_mapped_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    cx1, cx2 = np.sort(np.random.choice(size + 1, 2, replace=False))
+    cx1, cx2 = np.sort(rng.choice(size + 1, 2, replace=False))
 
     def one_offspring(p1, p2):
-        offspring = np.empty(size, dtype=int)
-        offspring[cx1:cx2] = p1[cx1:cx2]
-
-        for i in np.concatenate([np.arange(0, cx1), np.arange(cx2, size)]):
-            candidate = p2[i]
-            while candidate in p1[cx1:cx2]:
-                candidate = p2[np.where(p1 == candidate)[0][0]]
+        position1 = _inverse_permutation(p1).tolist()
+        genes2 = p2.tolist()
+        offspring = genes2[:]
+        offspring[cx1:cx2] = p1[cx1:cx2].tolist()
+
+        for i in [*range(cx1), *range(cx2, size)]:
+            candidate = genes2[i]
+            while cx1 <= position1[candidate] < cx2:
+                candidate = genes2[position1[candidate]]
             offspring[i] = candidate
-        return offspring
+        return np.array(offspring, dtype=p1.dtype)
 
     return one_offspring(parent1, parent2), one_offspring(parent2, parent1)
 
 
-def edge_recombination_crossover(parent1, parent2):
+def edge_recombination_crossover(parent1, parent2, rng=np.random):
     size = len(parent1)
-    edges = {}
-
-    for i, v in enumerate(parent1):
-        j = np.where(parent2 == v)[0][0]
-        edges[v] = [parent1[(i - 1) % size], parent1[(i + 1) % size],
-                    parent2[(j - 1) % size], parent2[(j + 1) % size]]
+    j = _inverse_permutation(parent2)[parent1]
+    edges = np.empty((max(parent1.max(), parent2.max()) + 1, 4), dtype=parent1.dtype)
+    edges[parent1] = np.column_stack([np.roll(parent1, 1), np.roll(parent1, -1),
+                                      parent2[(j - 1) % size], parent2[(j + 1) % size]])
+    edges = edges.tolist()
 
     def one_offspring(parent):
-        offspring = np.empty(size, dtype=int)
-        missing = list(parent[1:])
-        offspring[0] = parent[0]
-        node = parent[0]
+        missing = parent[1:].tolist()
+        missing_index = [0] * len(edges)
+        is_missing = [False] * len(edges)
+        for index, node in enumerate(missing):
+            missing_index[node] = index
+            is_missing[node] = True
+
+        node = int(parent[0])
+        offspring = [node]
+
+        for r in rng.random(size - 1).tolist():
+            nodes = [v for v in edges[node] if is_missing[v]]
+            node = nodes[int(r * len(nodes))] if nodes else missing[int(r * len(missing))]
+            offspring.append(node)
 
-        for index in range(1, size):
-            nodes = np.array(edges[node])
-            nodes = nodes[np.in1d(nodes, missing)]
-            next_node = np.random.choice(nodes) if nodes.size else np.random.choice(missing)
-            offspring[index] = next_node
-            node = next_node
-            missing.remove(next_node)
+            last = missing.pop()
+            if last != node:
+                missing[missing_index[node]] = last
+                missing_index[last] = missing_index[node]
+            is_missing[node] = False
 
-        return offspring
+        return np.array(offspring, dtype=parent.dtype)
 
     return one_offspring(parent1), one_offspring(parent2)
 
 
-def shuffle_mutation(individual):
+def _inverse_permutation(permutation):
+    inverse = np.empty(permutation.max(initial=0) + 1, dtype=np.intp)
+    inverse[permutation] = np.arange(len(permutation))
+    return inverse
+
+
+def batch_order_crossover(parents1, parents2, rng=np.random, out=None):
+    num_pairs, size = parents1.shape
+    cx1, cx2 = np.sort(np.argsort(rng.random((num_pairs, size + 1)), axis=1)[:, :2], axis=1).T
+    in_segment = (np.arange(size) >= cx1[:, np.newaxis]) & (np.arange(size) < cx2[:, np.newaxis])
+
+    missing1 = ~_lookup_by_gene(parents1, in_segment, parents2)
+    missing2 = ~_lookup_by_gene(parents2, in_segment, parents1)
+
+    offspring1, offspring2 = _offspring_buffers(parents1, parents2, out)
+    np.copyto(offspring1, parents1, where=in_segment)
+    np.copyto(offspring2, parents2, where=in_segment)
+    offspring1[~in_segment] = parents2[missing1]
+    offspring2[~in_segment] = parents1[missing2]
+
+    return offspring1, offspring2
+
+
+def batch_order_based_crossover(parents1, parents2, rng=np.random, out=None):
+    selected = rng.random(parents1.shape) < 0.5
+
+    matching1 = _lookup_by_gene(parents1, selected, parents2)
+    matching2 = _lookup_by_gene(parents2, selected, parents1)
+
+    offspring1, offspring2 = _offspring_buffers(parents1, parents2, out)
+    offspring1[:], offspring2[:] = parents2, parents1
+    offspring1[matching1] = parents1[selected]
+    offspring2[matching2] = parents2[selected]
+
+    return offspring1, offspring2
+
+
+def batch_position_based_crossover(parents1, parents2, rng=np.random, out=None):
+    selected = rng.random(parents1.shape) < 0.5
+
+    missing1 = ~_lookup_by_gene(parents1, selected, parents2)
+    missing2 = ~_lookup_by_gene(parents2, selected, parents1)
+
+    offspring1, offspring2 = _offspring_buffers(parents1, parents2, out)
+    np.copyto(offspring1, parents1, where=selected)
+    np.copyto(offspring2, parents2, where=selected)
+    offspring1[~selected] = parents2[missing1]
+    offspring2[~selected] = parents1[missing2]
+
+    return offspring1, offspring2
+
+
+def _offspring_buffers(parents1, parents2, out=None):
+    return out if out is not None else (np.empty_like(parents1), np.empty_like(parents2))
+
+
+def _lookup_by_gene(parents, values, genes):
+    num_rows, size = parents.shape
+    rows = np.arange(num_rows)[:, np.newaxis]
+    positions = np.empty((num_rows, parents.max(initial=0) + 1), dtype=np.intp)
+    positions[rows, parents] = np.arange(size)
+    return values[rows, positions[rows, genes]]
+
+
+BATCH_CROSSOVERS = {order_crossover: batch_order_crossover,
+                    order_based_crossover: batch_order_based_crossover,
+                    position_based_crossover: batch_position_based_crossover}
+
+
+def roulette_wheel_selection(scores, size, rng=np.random):
+    inverted_scores = 1 / scores
+    probabilities = inverted_scores / np.sum(inverted_scores)
+    return rng.choice(len(scores), p=probabilities, size=size)
+
+
+def tournament_selection(scores, size, rng=np.random, tournament_size=3):
+    contenders = rng.choice(len(scores), size=(size, tournament_size))
+    return contenders[np.arange(size), np.argmin(scores[contenders], axis=1)]
+
+
+def linear_rank_selection(scores, size, rng=np.random, pressure=1.5):
+    count = len(scores)
+    if count == 1:
+        return np.zeros(size, dtype=int)
+
+    ranks = np.empty(count)
+    ranks[np.argsort(scores)[::-1]] = np.arange(count)
+    probabilities = (2 - pressure) / count + 2 * ranks * (pressure - 1) / (count * (count - 1))
+    return rng.choice(count, p=probabilities, size=size)
+
+
+def stochastic_universal_sampling(scores, size, rng=np.random):
+    fitness = np.max(scores) - scores
+    if not np.sum(fitness) > 0:
+        fitness = np.ones(len(scores))
+
+    pointers = (rng.random() + np.arange(size)) * np.sum(fitness) / size
+    selected = np.minimum(np.searchsorted(np.cumsum(fitness), pointers, side="right"), len(scores) - 1)
+    return rng.permutation(selected)
+
+
+def shuffle_mutation(individual, rng=np.random):
     size = len(individual)
-    indices = np.random.choice([True, False], size)
+    indices = rng.choice([True, False], size)
     subset = individual[indices]
-    np.random.shuffle(subset)
+    rng.shuffle(subset)
     individual[indices] = subset
 
 
-def add_subtract_mutation(individual):
-    idx1 = np.random.choice(np.nonzero(individual)[0])
+def batch_shuffle_mutation(population, rng=np.random, rows=None):
+    selected = rng.random(population.shape) < 0.5
+    if rows is not None:
+        selected &= rows[:, np.newaxis]
+    rows = np.nonzero(selected)[0]
+    order = np.lexsort((rng.random(len(rows)), rows))
+    population[selected] = population[selected][order]
+
+
+def add_subtract_mutation(individual, rng=np.random):
+    idx1 = rng.choice(np.nonzero(individual)[0])
     idx2 = idx1
     while idx2 == idx1:
-        idx2 = np.random.randint(len(individual))
+        idx2 = rng.choice(len(individual))
 
     individual[idx1] -= 1
     individual[idx2] += 1
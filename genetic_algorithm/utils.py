@@ -1,7 +1,6 @@
-import matplotlib.pyplot as plt
+def plot_results(global_best_scores, best_scores, mean_scores, block=True):
+    import matplotlib.pyplot as plt
 
-
-def plot_results(global_best_scores, best_scores, mean_scores):
     best_generation = best_scores.index(min(best_scores))
     plt.figure(figsize=(10, 5))
     plt.plot(range(len(global_best_scores)), global_best_scores, label='Global Best Score', marker='o')
@@ -13,4 +12,4 @@ def plot_results(global_best_scores, best_scores, mean_scores):
     plt.legend()
     plt.title('Evolution of Best Scores')
     plt.grid(True)
-    plt.show()
+    plt.show(block=block)
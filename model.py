@@ -1,8 +1,9 @@
 from time import time as measure_time
 
 from customers import *
-from genetic_algorithm import GA
-from genetic_algorithm.strategies import order_crossover
+from distance_cache import DistanceMatrixCache
+from genetic_algorithm import GA, IslandGA, FitnessCache
+from genetic_algorithm.strategies import order_crossover, roulette_wheel_selection
 
 
 class Model:
@@ -17,13 +18,25 @@ class Model:
     DEFAULT_DISTANCE_FACTOR = 1.
     DEFAULT_TIME_FACTOR = 1.
     DEFAULT_CROSSOVER_METHOD = order_crossover
+    DEFAULT_SELECTION_METHOD = roulette_wheel_selection
+    DEFAULT_ELITE_COUNT = 0
+    DEFAULT_DISTANCE_DTYPE = np.float64
+    DEFAULT_MIGRATION_INTERVAL = 10
+    DEFAULT_FITNESS_CACHE_SIZE = 1024
+    DEFAULT_BACKEND = GA.NUMPY
 
     customers = []
     targets = []
+    coordinates = np.empty((0, 2))
     distance_matrix = np.empty((0, 0))
     depot = Point(0, 0)
 
-    def __init__(self):
+    def __init__(self, distance_dtype=DEFAULT_DISTANCE_DTYPE, distance_cache: DistanceMatrixCache = None,
+                 backend=DEFAULT_BACKEND, fitness_cache_size=DEFAULT_FITNESS_CACHE_SIZE):
+        self.distance_dtype = distance_dtype
+        self.distance_cache = distance_cache
+        self.backend = backend
+        self.fitness_cache_size = fitness_cache_size
         self.result_history = ResultHistory()
 
     def generate_customers(self, count=DEFAULT_CUSTOMER_COUNT, customer_class=Customer):
@@ -42,10 +55,10 @@ class Model:
         self.customers = [Customer(Point(x, y)) for x, y in zip(point_x, point_y)]
         self.update_targets()
 
-    def update_targets(self):
+    def update_targets(self, distance_matrix=None):
         self.targets = self.customers[:]
         self.add_depot()
-        self.calculate_distance_matrix()
+        self.calculate_distance_matrix(distance_matrix)
         self.result_history.clear()
 
     def add_depot(self):
@@ -54,13 +67,62 @@ class Model:
 
     def set_depot_position(self, x, y):
         self.depot.x, self.depot.y = x, y
-        self.update_targets()
+        if not self.targets:
+            self.update_targets()
+            return
+
+        self.targets[0] = type(self.targets[0])(self.depot)
+        self.coordinates[0] = self.targets[0].get_coordinates()
+        self.update_target_distances(0)
+        self.result_history.clear()
+
+    def add_customer(self, customer):
+        if not self.customers or type(customer) is not type(self.customers[0]):
+            self.customers = self.customers + [customer]
+            self.update_targets()
+            return
+
+        self.customers.append(customer)
+        self.targets.append(customer)
+        self.coordinates = np.vstack([self.coordinates, np.array(customer.get_coordinates(), self.distance_dtype)])
+
+        size = len(self.targets)
+        distance_matrix = np.empty((size, size), dtype=self.distance_dtype)
+        distance_matrix[:-1, :-1] = self.distance_matrix
+        self.distance_matrix = distance_matrix
+        self.update_target_distances(size - 1)
+        self.result_history.clear()
+
+    def remove_customer(self, index):
+        self.customers.pop(index)
+        if not self.customers:
+            self.update_targets()
+            return
 
-    def calculate_distance_matrix(self):
-        self.distance_matrix = np.zeros((len(self.targets), len(self.targets)))
-        for i, target1 in enumerate(self.targets):
-            for j, target2 in enumerate(self.targets):
-                self.distance_matrix[i, j] = target1.distance(target2)
+        self.targets.pop(index + 1)
+        self.coordinates = np.delete(self.coordinates, index + 1, axis=0)
+        self.distance_matrix = np.delete(np.delete(self.distance_matrix, index + 1, axis=0), index + 1, axis=1)
+        self.result_history.clear()
+
+    def calculate_distance_matrix(self, distance_matrix=None):
+        self.coordinates = np.array([target.get_coordinates() for target in self.targets], dtype=self.distance_dtype)
+        if distance_matrix is not None and distance_matrix.shape == (len(self.targets), len(self.targets)):
+            self.distance_matrix = distance_matrix if distance_matrix.dtype == self.distance_dtype \
+                else distance_matrix.astype(self.distance_dtype)
+        elif self.distance_cache is not None:
+            self.distance_matrix = self.distance_cache.get_distance_matrix(type(self.targets[0]), self.coordinates,
+                                                                           self.distance_dtype)
+        else:
+            self.distance_matrix = type(self.targets[0]).calculate_distance_matrix(self.coordinates,
+                                                                                   self.distance_dtype)
+
+    def update_target_distances(self, index):
+        target_class = type(self.targets[0])
+        target_coordinates = self.coordinates[index:index + 1]
+        self.distance_matrix[index, :] = target_class.calculate_distances(target_coordinates, self.coordinates,
+                                                                          self.distance_dtype)[0]
+        self.distance_matrix[:, index] = target_class.calculate_distances(self.coordinates, target_coordinates,
+                                                                          self.distance_dtype)[:, 0]
 
     def generate_routes(self,
                         vehicle_count=DEFAULT_VEHICLE_COUNT,
@@ -72,17 +134,28 @@ class Model:
                         time_factor=DEFAULT_TIME_FACTOR,
                         crossover_method=DEFAULT_CROSSOVER_METHOD,
                         enable_2_opt=False,
+                        enable_inter_route=False,
+                        selection_method=DEFAULT_SELECTION_METHOD,
+                        elite_count=DEFAULT_ELITE_COUNT,
+                        time_limit=None,
+                        stall_limit=None,
+                        target_score=None,
                         output=True,
-                        show_plot=True):
+                        show_plot=True,
+                        islands=1,
+                        migration_interval=DEFAULT_MIGRATION_INTERVAL,
+                        rng=None,
+                        cancellation=None):
         try:
-            ga = GA(len(self.customers), vehicle_count, distance_factor, time_factor, self.calculate_total_distance)
+            ga = self.create_solver(vehicle_count, distance_factor, time_factor, islands, migration_interval, rng)
             start_time = measure_time()
-            solution, distance, time, score, best_scores_history = ga.evolve(size, generations, pc, pm,
-                                                                             crossover_method, enable_2_opt, show_plot)
+            solution, distance, time, score, best_scores_history, stop_reason = ga.evolve(
+                size, generations, pc, pm, crossover_method, enable_2_opt, show_plot, enable_inter_route,
+                selection_method, elite_count, time_limit, stall_limit, target_score, cancellation)
             exec_time = measure_time() - start_time
 
-            self.result_history.add(
-                Result(self.calculate_routes_vectors(solution), distance, time, score, best_scores_history, exec_time))
+            self.result_history.add(Result(self.calculate_routes_vectors(solution), distance, time, score,
+                                           best_scores_history, exec_time, stop_reason, solution, ga.cache_stats))
 
             if output:
                 print("Solution: ", solution)
@@ -90,6 +163,49 @@ class Model:
         except ValueError as e:
             print(f"ValueError: {e}")
 
+    def generate_routes_iter(self,
+                             vehicle_count=DEFAULT_VEHICLE_COUNT,
+                             size=DEFAULT_POP_SIZE,
+                             generations=DEFAULT_GENERATIONS,
+                             pc=DEFAULT_PC,
+                             pm=DEFAULT_PM,
+                             distance_factor=DEFAULT_DISTANCE_FACTOR,
+                             time_factor=DEFAULT_TIME_FACTOR,
+                             crossover_method=DEFAULT_CROSSOVER_METHOD,
+                             enable_2_opt=False,
+                             enable_inter_route=False,
+                             selection_method=DEFAULT_SELECTION_METHOD,
+                             elite_count=DEFAULT_ELITE_COUNT,
+                             time_limit=None,
+                             stall_limit=None,
+                             target_score=None,
+                             islands=1,
+                             migration_interval=DEFAULT_MIGRATION_INTERVAL,
+                             rng=None,
+                             cancellation=None):
+        ga = self.create_solver(vehicle_count, distance_factor, time_factor, islands, migration_interval, rng)
+        start_time = measure_time()
+        best_scores_history = []
+
+        for step in ga.evolve_iter(size, generations, pc, pm, crossover_method, enable_2_opt, enable_inter_route,
+                                   selection_method, elite_count, time_limit, stall_limit, target_score,
+                                   cancellation):
+            if step.improved:
+                solution, distance, time = step.solution, step.distance, step.time
+            best_scores_history.append(step.global_best_score)
+            yield step
+
+        self.result_history.add(Result(self.calculate_routes_vectors(solution), distance, time,
+                                       best_scores_history[-1], best_scores_history, measure_time() - start_time,
+                                       step.stop_reason, solution, ga.cache_stats))
+
+    def create_solver(self, vehicle_count, distance_factor, time_factor, islands=1,
+                      migration_interval=DEFAULT_MIGRATION_INTERVAL, rng=None):
+        fitness_cache = FitnessCache(self.fitness_cache_size) if self.fitness_cache_size else None
+        ga = GA(len(self.customers), vehicle_count, distance_factor, time_factor, self.calculate_total_distance,
+                self.distance_matrix, rng, fitness_cache, backend=self.backend)
+        return IslandGA(ga, islands, migration_interval) if islands > 1 else ga
+
     def calculate_routes_vectors(self, solution):
         routes = []
         for route in solution:
@@ -105,12 +221,18 @@ class Model:
         return np.sum(self.distance_matrix[routes[:-1], routes[1:]])
 
     def save_customers(self, file_path):
-        if self.customers:
+        if not self.customers:
+            return
+        if file_path.endswith(INSTANCE_EXTENSION):
+            write_instance_to_file(file_path, self.customers, self.depot, self.distance_matrix)
+        else:
             write_customers_to_file(self.customers, self.customers[0].COLUMNS, file_path)
 
     def read_customers(self, file_path):
-        self.customers = read_customers_from_file(file_path)
-        self.update_targets()
+        self.customers, depot, distance_matrix = read_instance_from_file(file_path)
+        if depot is not None:
+            self.depot = depot
+        self.update_targets(distance_matrix)
 
     @property
     def result(self):
@@ -122,13 +244,17 @@ class Model:
 
 class Result:
 
-    def __init__(self, routes=None, distance=0., time=0., score=0., best_scores_history=None, execution_time=0.):
+    def __init__(self, routes=None, distance=0., time=0., score=0., best_scores_history=None, execution_time=0.,
+                 stop_reason="", solution=None, cache_stats=None):
         self.routes = routes if routes is not None else []
         self.distance = distance
         self.time = time
         self.score = score
         self.best_scores_history = best_scores_history if best_scores_history is not None else []
         self.execution_time = execution_time
+        self.stop_reason = stop_reason
+        self.solution = solution if solution is not None else []
+        self.cache_stats = cache_stats if cache_stats is not None else {}
 
 
 class ResultHistory:
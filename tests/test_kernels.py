@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from customers import Customer
+from genetic_algorithm import GA, kernels, strategies
+from model import Model
+
+CROSSOVERS = ("cycle_crossover", "partially_mapped_crossover", "edge_recombination_crossover")
+
+
+def variants(func):
+    return [func, func.py_func] if hasattr(func, "py_func") else [func]
+
+
+def create_model(customer_count=40, distance_dtype=np.float64):
+    np.random.seed(0)
+    model = Model(distance_dtype=distance_dtype)
+    model.generate_customers(customer_count, Customer)
+    return model
+
+
+def create_ga(model, vehicle_count=3, backend=GA.NUMPY):
+    with mock.patch.object(kernels, "NUMBA_AVAILABLE", True):
+        return GA(len(model.customers), vehicle_count, 1., 1., model.calculate_total_distance, model.distance_matrix,
+                  np.random.default_rng(0), backend=backend)
+
+
+def route_cost(route, distance_matrix):
+    route = np.asarray(route)
+    return float(np.sum(distance_matrix[route[:-1], route[1:]], dtype=np.float64))
+
+
+def has_improving_move(route, distance_matrix):
+    d = distance_matrix.astype(np.float64)
+    route = np.asarray(route)
+    i, j = np.triu_indices(len(route) - 1, 2)
+    full_reversal = (i == 0) & (j == len(route) - 2)
+    i, j = i[~full_reversal], j[~full_reversal]
+    removed = d[route[i], route[i + 1]] + d[route[j], route[j + 1]]
+    added = d[route[i], route[j]] + d[route[i + 1], route[j + 1]]
+    return bool(np.any(added - removed < -1e-9 * np.maximum(removed, 1.)))
+
+
+class KernelParityTest(unittest.TestCase):
+
+    def test_evaluate_matches_evaluate_batch(self):
+        for distance_dtype in (np.float64, np.float32):
+            model = create_model(distance_dtype=distance_dtype)
+            ga = create_ga(model, vehicle_count=4)
+            population = ga.generate_population(100)
+            expected = ga.evaluate_batch(population)
+            for evaluate in variants(kernels.evaluate):
+                np.testing.assert_allclose(evaluate(population, model.distance_matrix, ga.customer_count, 1., 1.),
+                                           expected, rtol=1e-6)
+
+    def test_crossovers_match_strategies(self):
+        rng = np.random.default_rng(1)
+        for size in (1, 2, 5, 40):
+            for dtype in (np.int16, np.int64):
+                parent1 = rng.permutation(np.arange(1, size + 1)).astype(dtype)
+                parent2 = rng.permutation(np.arange(1, size + 1)).astype(dtype)
+                for name in CROSSOVERS:
+                    expected = getattr(strategies, name)(parent1, parent2, np.random.default_rng(size))
+                    actual = getattr(kernels, name)(parent1, parent2, np.random.default_rng(size))
+                    for expected_child, actual_child in zip(expected, actual):
+                        np.testing.assert_array_equal(actual_child, expected_child, err_msg=name)
+                        self.assertEqual(actual_child.dtype, expected_child.dtype)
+
+    def test_two_opt_matches_numpy_local_optimum(self):
+        for distance_dtype in (np.float64, np.float32):
+            model = create_model(customer_count=20, distance_dtype=distance_dtype)
+            ga = create_ga(model)
+            route = [0] + list(np.random.default_rng(2).permutation(np.arange(1, 21))) + [0]
+            numpy_route = ga.two_opt(route)
+
+            for two_opt in variants(kernels.two_opt):
+                kernel_route = two_opt(np.array(route), model.distance_matrix).tolist()
+                self.assertEqual(sorted(kernel_route), sorted(route))
+                self.assertEqual((kernel_route[0], kernel_route[-1]), (0, 0))
+                self.assertLess(route_cost(kernel_route, model.distance_matrix),
+                                route_cost(route, model.distance_matrix))
+
+                self.assertFalse(has_improving_move(kernel_route, model.distance_matrix))
+                self.assertAlmostEqual(route_cost(ga.two_opt(kernel_route), model.distance_matrix),
+                                       route_cost(kernel_route, model.distance_matrix), places=3)
+                polished = two_opt(np.array(numpy_route), model.distance_matrix).tolist()
+                self.assertLessEqual(route_cost(polished, model.distance_matrix),
+                                     route_cost(numpy_route, model.distance_matrix) + 1e-6)
+
+    def test_backends_give_identical_scores(self):
+        model = create_model()
+        for crossover_method in (strategies.cycle_crossover, strategies.partially_mapped_crossover,
+                                 strategies.edge_recombination_crossover):
+            scores = [create_ga(model, backend=backend).evolve(40, 15, 0.7, 0.1, crossover_method, show_plot=False)[3]
+                      for backend in GA.BACKENDS]
+            self.assertAlmostEqual(scores[0], scores[1], places=6)
+
+    def test_float32_two_opt_terminates(self):
+        model = create_model(distance_dtype=np.float32)
+        ga = create_ga(model, backend=GA.NUMBA)
+        solution = ga.evolve(20, 5, 0.7, 0.1, enable_2_opt=True, show_plot=False)[0]
+        self.assertEqual(sorted(c for route in solution for c in route if c), list(range(1, 41)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import colorsys
-from tkinter import ttk, filedialog
+from tkinter import PhotoImage, ttk, filedialog
 
 from controller import Controller
 from model import Model
@@ -11,10 +11,15 @@ class GUI:
     POINT_RADIUS = 7
     DEPOT_RADIUS = 8
     ARROW_SHAPE = (16, 18, 5)
+    ARROW_STUB = 1e-3
+    FILE_TYPES = [("CSV Files", "*.csv"), ("NumPy Instances", "*.npz")]
 
     def __init__(self, model: Model, controller: Controller, root):
         self.model = model
         self.controller = controller
+        self._marker_images = {}
+        self._points = None
+        self._route_items = []
 
         root.title("VRP Optimization")
         self.canvas = ZoomPanCanvas(root, bg="white")
@@ -31,47 +36,100 @@ class GUI:
         tabs.add(self.environment_tab, text="Environment")
         tabs.add(self.view_tab, text="View")
 
-    def update_canvas(self):
-        self.canvas.delete("all")
-        self.draw_routes()
-        self.draw_depot()
-        self.draw_customer_points()
+    def update_canvas(self, routes=None):
+        points_changed = self.draw_points()
+        self.draw_routes(routes)
         self.optimization_tab.update_result(self.model)
-        self.canvas.recenter()
+        if points_changed:
+            self.canvas.recenter()
+
+    def draw_points(self):
+        points = [(self.model.depot.x, self.model.depot.y)] + [tuple(c.get_coordinates()) for c in self.model.customers]
+        if points == self._points:
+            return False
+
+        self._points = points
+        self.canvas.set_points(self.depot_points() + self.customer_points(),
+                               self.marker_image(self.POINT_RADIUS, "lightgray"), self.DEPOT_RADIUS)
+        return True
+
+    def draw_routes(self, routes=None):
+        if routes is None and self.model.result:
+            routes = self.model.result.routes
+        paths = [self.route_path(route) for route in routes] if routes and self.view_tab.should_show_routes() else []
+        colors = self.generate_colors(len(paths))
+
+        for key, items in self._route_items[len(paths):]:
+            self.canvas.delete(*items)
+        del self._route_items[len(paths):]
+
+        for index, key in enumerate(zip(paths, colors)):
+            if index < len(self._route_items):
+                if self._route_items[index][0] == key:
+                    continue
+                self.canvas.delete(*self._route_items[index][1])
+                self._route_items[index] = key, self.draw_route(*key)
+            else:
+                self._route_items.append((key, self.draw_route(*key)))
+
+        self.canvas.set_arrows([arrow for key, items in self._route_items for arrow in self.route_arrows(*key)],
+                               self.ARROW_SHAPE)
+
+    def draw_route(self, path, color):
+        if len(path) < 2:
+            return []
+        return [self.canvas.create_line(*self.canvas.to_canvas_coords(c for point in path for c in point),
+                                        fill=color, tags="route")]
+
+    def route_arrows(self, path, color):
+        return [((x2 - (x2 - x1) * self.ARROW_STUB, y2 - (y2 - y1) * self.ARROW_STUB, x2, y2), color)
+                for (x1, y1), (x2, y2) in zip(path, path[1:]) if (x1, y1) != (x2, y2)]
 
-    def draw_routes(self):
-        if self.model.result:
-            colors = self.generate_colors(len(self.model.result.routes))
-            for index, route in enumerate(self.model.result.routes):
-                for vector in route:
-                    self.draw_vector(vector[0], vector[1], colors[index])
-
-    def draw_vector(self, start, end, color="grey80"):
-        if self.view_tab.should_show_routes():
-            self.canvas.create_line(start.x, start.y, end.x, end.y, fill=color, arrow='last',
-                                    arrowshape=self.ARROW_SHAPE)
+    @staticmethod
+    def route_path(route):
+        if not route:
+            return ()
+        return ((route[0][0].x, route[0][0].y),) + tuple((end.x, end.y) for start, end in route)
 
-    def draw_depot(self):
-        self.draw_point(self.model.depot, radius=self.DEPOT_RADIUS, color="grey")
+    def depot_points(self):
+        return [self.point_marker(self.model.depot, radius=self.DEPOT_RADIUS, color="grey")]
 
-    def draw_customer_points(self):
+    def customer_points(self):
+        points = []
         for index, customer in enumerate(self.model.customers):
-            self.draw_point(customer, self.POINT_RADIUS, "white", index + 1)
+            points.append(self.point_marker(customer, self.POINT_RADIUS, "white", index + 1))
             if hasattr(customer, "end"):
-                self.draw_point(customer.end, self.POINT_RADIUS, "black", index + 1, "white")
+                points.append(self.point_marker(customer.end, self.POINT_RADIUS, "black", index + 1, "white"))
+        return points
+
+    def point_marker(self, point, radius, color="white", text="", text_color="black"):
+        return point.x, point.y, self.marker_image(radius, color), text, text_color
+
+    def marker_image(self, radius, color, outline="gray"):
+        key = radius, color, outline
+        if key not in self._marker_images:
+            image = PhotoImage(width=2 * radius + 1, height=2 * radius + 1)
+            for dy in range(-radius, radius + 1):
+                row = dy + radius
+                image.put(outline, to=self._disk_row(radius, dy, row))
+                if abs(dy) < radius:
+                    image.put(color, to=self._disk_row(radius - 1, dy, row, radius))
+            self._marker_images[key] = image
+        return self._marker_images[key]
 
-    def draw_point(self, point, radius, color="white", text="", text_color="black"):
-        self.canvas.create_oval(point.x - radius, point.y - radius, point.x + radius, point.y + radius,
-                                outline="gray", fill=color, tags="fixed_scale")
-        self.canvas.create_text(point.x, point.y, text=text, fill=text_color)
+    @staticmethod
+    def _disk_row(radius, dy, row, center=None):
+        center = radius if center is None else center
+        half_width = int(max((radius + 0.5) ** 2 - dy ** 2, 0) ** 0.5)
+        return center - half_width, row, center + half_width + 1, row + 1
 
     @staticmethod
     def ask_open_file_dialog():
-        return filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
+        return filedialog.askopenfilename(filetypes=GUI.FILE_TYPES)
 
     @staticmethod
     def ask_save_as_file_dialog():
-        return filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        return filedialog.asksaveasfilename(defaultextension=".csv", filetypes=GUI.FILE_TYPES)
 
     @staticmethod
     def generate_colors(count):
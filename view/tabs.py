@@ -16,6 +16,12 @@ class OptimizationTab(Frame):
     ERX = "edge recombination crossover"
     CROSSOVER_METHODS = {OX1: order_crossover, OX2: order_based_crossover, POS: position_based_crossover,
                          CX: cycle_crossover, PMX: partially_mapped_crossover, ERX: edge_recombination_crossover}
+    RWS = "roulette wheel selection"
+    TOS = "tournament selection"
+    LRS = "linear rank selection"
+    SUS = "stochastic universal sampling"
+    SELECTION_METHODS = {RWS: roulette_wheel_selection, TOS: tournament_selection, LRS: linear_rank_selection,
+                         SUS: stochastic_universal_sampling}
 
     def __init__(self, master, controller, *args, **kwargs):
         super().__init__(master, *args, **kwargs)
@@ -33,9 +39,20 @@ class OptimizationTab(Frame):
         self._crossover_method = ttk.Combobox(self, state="readonly",
                                               values=[self.OX1, self.OX2, self.POS, self.CX, self.PMX, self.ERX])
         self._crossover_method.set(self.OX1)
+        self._selection_method = ttk.Combobox(self, state="readonly", values=[self.RWS, self.TOS, self.LRS, self.SUS])
+        self._selection_method.set(self.RWS)
+        self._elite_count_input = IntInput(self, "Elitism:", 0, 9999, Model.DEFAULT_ELITE_COUNT)
         self._enable_2_opt = BooleanVar(value=False)
         Checkbutton(self, text="Enable 2-opt", variable=self._enable_2_opt)
-        Button(self, text="Run", command=self.generate_routes)
+        self._enable_inter_route = BooleanVar(value=False)
+        Checkbutton(self, text="Enable inter-route search", variable=self._enable_inter_route)
+        self._show_plot = BooleanVar(value=True)
+        Checkbutton(self, text="Show plot", variable=self._show_plot)
+        run_frame = Frame(self)
+        self._run_button = Button(run_frame, text="Run", command=self.generate_routes)
+        self._cancel_button = Button(run_frame, text="Cancel", command=controller.cancel_routes_generation,
+                                     state="disabled")
+        self._progress_info = Label(self, text="")
 
         self.result_frame = ttk.LabelFrame(self, text="Result")
         self._result_info = Label(self.result_frame, justify="left")
@@ -46,6 +63,7 @@ class OptimizationTab(Frame):
 
         pack_children_of(self)
         pack_children_of(row3_frame, padx=0, pady=0, side="left")
+        pack_children_of(run_frame, padx=5, pady=0, side="left", expand=True)
         pack_children_of(self.result_frame, pady=10)
         pack_children_of(navigation_frame, padx=5, pady=0, side="left", expand=True)
         self._size_input.pack(side="left")
@@ -61,6 +79,18 @@ class OptimizationTab(Frame):
             self._result_info.config(text=self.retrieve_result_info_text(model.result))
             self.pagination_indicator.config(text=model.get_pagination_indicator())
 
+    def set_running(self, running):
+        self._run_button.config(state="disabled" if running else "normal")
+        self._cancel_button.config(state="normal" if running else "disabled")
+        if not running:
+            self._progress_info.config(text="")
+
+    def update_progress(self, step):
+        self._progress_info.config(text=f"Generation: {step.generation} Best: {round(step.global_best_score, 2)}")
+
+    def should_show_plot(self):
+        return self._show_plot.get()
+
     def generate_routes(self):
         self.controller.generate_routes(
             self._vehicle_count_input.get_value(),
@@ -71,12 +101,18 @@ class OptimizationTab(Frame):
             self._distance_factor_input.get_value(),
             self._time_factor_input.get_value(),
             self.get_crossover_method(),
-            self._enable_2_opt.get()
+            self._enable_2_opt.get(),
+            self._enable_inter_route.get(),
+            self.get_selection_method(),
+            self._elite_count_input.get_value()
         )
 
     def get_crossover_method(self):
         return self.CROSSOVER_METHODS[self._crossover_method.get()]
 
+    def get_selection_method(self):
+        return self.SELECTION_METHODS[self._selection_method.get()]
+
     @staticmethod
     def retrieve_result_info_text(result: Result):
         return (
@@ -84,6 +120,7 @@ class OptimizationTab(Frame):
             f"Time: {round(result.time, 2)}\n\n"
             f"Score: {round(result.score, 2)}\n\n"
             f"Exec. time: {round(result.execution_time, 2)}s\n\n"
+            f"Stopped by: {result.stop_reason}\n\n"
             f"Vehicles: {sum(1 for route in result.routes if route)}/{len(result.routes)}"
         )
 
@@ -1,35 +1,165 @@
 from tkinter import Canvas
 
+import numpy as np
+
 
 class ZoomPanCanvas(Canvas):
     CANVAS_WIDTH = 800
     CANVAS_HEIGHT = 600
     CANVAS_MARGIN = 50
+    LABEL_MIN_SPACING = 24
+    ARROW_MIN_SPACING = 40
+    CLUSTER_MIN_SPACING = 16
+    CLUSTER_CELL_SIZE = 30
+    CULL_MARGIN = 0.5
+    REFRESH_SCALE_RATIO = 1.5
+    REFRESH_DELAY = 100
 
     def __init__(self, master, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, *args, **kwargs):
         super().__init__(master, *args, **kwargs, width=width, height=height)
 
         self.current_scale = 1.0
+        self.point_xs, self.point_ys = np.empty(0), np.empty(0)
+        self.point_images, self.point_labels, self.point_label_colors = [], [], []
+        self.cluster_image = None
+        self.point_radius = 0
+        self.arrow_coords, self.arrow_colors = np.empty((0, 4)), []
+        self.arrow_shape = None
+        self.spacing = np.inf
+        self.culled_area = None
+        self.culled_scale = None
+        self._refresh_job = None
 
         self.bind("<MouseWheel>", self.zoom)
         self.bind("<ButtonPress-1>", self.start_pan)
         self.bind("<B1-Motion>", self.pan)
+        self.bind("<Configure>", lambda event: self.schedule_refresh())
+        self.bind("<Destroy>", lambda event: self._cancel_refresh())
 
     def zoom(self, event):
         scale_factor = 1.1 if event.delta > 0 else 0.9
         self._update_scale(scale_factor)
+        self._refresh_if_needed()
 
     def start_pan(self, event):
         self.scan_mark(event.x, event.y)
 
     def pan(self, event):
         self.scan_dragto(event.x, event.y, gain=1)
+        self._refresh_if_needed()
 
     def recenter(self):
         self._reset_view()
+        bbox = self._content_bbox()
+        if bbox is None:
+            return
         width, height = self.winfo_width(), self.winfo_height()
-        self._resize_to_fit(width, height)
-        self._center_view(width, height)
+        self._resize_to_fit(width, height, bbox)
+        self._center_view(width, height, self._content_bbox())
+        self.refresh_points()
+
+    def to_canvas_coords(self, coords):
+        return [value * self.current_scale for value in coords]
+
+    def set_points(self, points, cluster_image=None, radius=0):
+        xs, ys, self.point_images, self.point_labels, self.point_label_colors = zip(*points) if points else [()] * 5
+        self.point_xs, self.point_ys = np.array(xs, dtype=float), np.array(ys, dtype=float)
+        self.cluster_image = cluster_image
+        self.point_radius = radius
+        self.refresh_points()
+
+    def set_arrows(self, arrows, shape=None):
+        coords, self.arrow_colors = zip(*arrows) if arrows else [(), ()]
+        self.arrow_coords = np.array(coords, dtype=float).reshape(-1, 4)
+        self.arrow_shape = shape
+        self.update_level_of_detail()
+
+    def schedule_refresh(self):
+        self._cancel_refresh()
+        self._refresh_job = self.after(self.REFRESH_DELAY, self.refresh_points)
+
+    def refresh_points(self):
+        self._cancel_refresh()
+        super().delete("point")
+
+        x1, y1, x2, y2 = self._visible_world_area()
+        in_view = self._within(self.point_xs, self.point_ys, x1, y1, x2, y2)
+        self.spacing = np.sqrt((x2 - x1) * (y2 - y1) / max(np.count_nonzero(in_view), 1)) * self.current_scale
+
+        margin_x, margin_y = (x2 - x1) * self.CULL_MARGIN, (y2 - y1) * self.CULL_MARGIN
+        self.culled_area = x1 - margin_x, y1 - margin_y, x2 + margin_x, y2 + margin_y
+        self.culled_scale = self.current_scale
+        visible = np.flatnonzero(self._within(self.point_xs, self.point_ys, *self.culled_area))
+
+        if self.spacing < self.CLUSTER_MIN_SPACING and self.cluster_image is not None:
+            self._draw_clusters(visible)
+        else:
+            label_state = "normal" if self.spacing >= self.LABEL_MIN_SPACING else "hidden"
+            for i in visible:
+                x, y = self.point_xs[i] * self.current_scale, self.point_ys[i] * self.current_scale
+                self.create_image(x, y, image=self.point_images[i], tags="point")
+                self.create_text(x, y, text=self.point_labels[i], fill=self.point_label_colors[i], state=label_state,
+                                 tags=("point", "label"))
+
+        self.update_level_of_detail()
+
+    def update_level_of_detail(self):
+        super().delete("arrow")
+        if self.spacing >= self.ARROW_MIN_SPACING and self.culled_area is not None:
+            visible = self._within(self.arrow_coords[:, 2], self.arrow_coords[:, 3], *self.culled_area)
+            for i in np.flatnonzero(visible):
+                self.create_line(*self.to_canvas_coords(self.arrow_coords[i]), fill=self.arrow_colors[i],
+                                 arrow="last", arrowshape=self.arrow_shape, tags=("route", "arrow"))
+        self.tag_raise("point")
+
+    def _draw_clusters(self, visible):
+        cell_size = self.CLUSTER_CELL_SIZE / self.current_scale
+        cells = np.column_stack((np.floor(self.point_xs[visible] / cell_size),
+                                 np.floor(self.point_ys[visible] / cell_size)))
+        cells, cluster_ids, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        cluster_ids = cluster_ids.ravel()
+        xs = np.bincount(cluster_ids, weights=self.point_xs[visible]) / counts * self.current_scale
+        ys = np.bincount(cluster_ids, weights=self.point_ys[visible]) / counts * self.current_scale
+
+        for x, y, count in zip(xs, ys, counts):
+            self.create_image(x, y, image=self.cluster_image, tags="point")
+            if count > 1:
+                self.create_text(x, y, text=count, tags=("point", "label"))
+
+    def _cancel_refresh(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+
+    def _refresh_if_needed(self):
+        if self.culled_area is None:
+            return
+        x1, y1, x2, y2 = self._visible_world_area()
+        culled_x1, culled_y1, culled_x2, culled_y2 = self.culled_area
+        scale_ratio = self.current_scale / self.culled_scale
+        if x1 < culled_x1 or y1 < culled_y1 or x2 > culled_x2 or y2 > culled_y2 or \
+                not 1 / self.REFRESH_SCALE_RATIO < scale_ratio < self.REFRESH_SCALE_RATIO:
+            self.schedule_refresh()
+
+    @staticmethod
+    def _within(xs, ys, x1, y1, x2, y2):
+        return (xs >= x1) & (xs <= x2) & (ys >= y1) & (ys <= y2)
+
+    def _visible_world_area(self):
+        x1, y1 = self.canvasx(0), self.canvasy(0)
+        x2, y2 = self.canvasx(self.winfo_width()), self.canvasy(self.winfo_height())
+        return x1 / self.current_scale, y1 / self.current_scale, x2 / self.current_scale, y2 / self.current_scale
+
+    def _content_bbox(self):
+        boxes = [self.bbox("all")] if self.find_all() else []
+        if self.point_xs.size:
+            r = self.point_radius
+            boxes.append((self.point_xs.min() * self.current_scale - r, self.point_ys.min() * self.current_scale - r,
+                          self.point_xs.max() * self.current_scale + r, self.point_ys.max() * self.current_scale + r))
+        if not boxes:
+            return None
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
 
     def _reset_view(self):
         self.xview_moveto(0)
@@ -38,13 +168,11 @@ class ZoomPanCanvas(Canvas):
         self.current_scale = 1.0
         self.update()
 
-    def _center_view(self, width, height):
-        bbox = self.bbox("all")
+    def _center_view(self, width, height, bbox):
         self.scan_mark(0, 0)
-        self.scan_dragto((width - (bbox[0] + bbox[2])) // 2, (height - (bbox[1] + bbox[3])) // 2, gain=1)
+        self.scan_dragto(int(width - (bbox[0] + bbox[2])) // 2, int(height - (bbox[1] + bbox[3])) // 2, gain=1)
 
-    def _resize_to_fit(self, width, height, margin=CANVAS_MARGIN):
-        bbox = self.bbox("all")
+    def _resize_to_fit(self, width, height, bbox, margin=CANVAS_MARGIN):
         scale_factor = min(width / (bbox[2] - bbox[0] + 2 * margin),
                            height / (bbox[3] - bbox[1] + 2 * margin))
         self._update_scale(scale_factor)
@@ -52,19 +180,10 @@ class ZoomPanCanvas(Canvas):
     def _update_scale(self, scale_factor):
         self.scale("all", 0, 0, scale_factor, scale_factor)
         self.current_scale *= scale_factor
-        self._maintain_fixed_size(scale_factor)
-
-    def _maintain_fixed_size(self, scale_factor):
-        fixed_scale_items = self.find_withtag("fixed_scale")
-        for item in fixed_scale_items:
-            x1, y1, x2, y2 = self.coords(item)
-            center_x = (x1 + x2) / 2
-            center_y = (y1 + y2) / 2
-            scaled_center_x = center_x * scale_factor
-            scaled_center_y = center_y * scale_factor
-            self.move(item, scaled_center_x - center_x, scaled_center_y - center_y)
-            self.scale(item, 0, 0, 1 / scale_factor, 1 / scale_factor)
 
     def delete(self, *args):
         super().delete(*args)
-        self._reset_view()
+        if "all" in args:
+            self.set_points([])
+            self.set_arrows([])
+            self._reset_view()